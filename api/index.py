@@ -7,4 +7,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
 # Set uploads to /tmp in serverless environment
 os.environ.setdefault("UPLOAD_DIR", "/tmp/uploads")
 
+# No long-lived worker tasks between invocations; requests that queue jobs
+# drain them after responding (see app/jobs.py)
+os.environ.setdefault("JOB_WORKERS", "0")
+
 from app.main import app  # noqa: E402, F401
@@ -0,0 +1,184 @@
+"""Tiered retention for contact inquiries.
+
+Read inquiries older than INQUIRY_RETENTION_DAYS are moved out of
+``contact_inquiries`` into ``contact_inquiries_archive``, packed as
+zlib-compressed BSON batches, so the hot collection the inbox sorts stays small.
+
+Each archive batch records the ids it contains. A batch is written before its
+inquiries are deleted from the hot collection, and a rerun only deletes ids
+that already appear in a batch, so an interrupted run can simply be started
+again.
+
+Runs in the background from the app lifespan, or once with
+``python -m app.archive``.
+"""
+import asyncio
+import logging
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+import bson
+
+from app import locks
+from app.config import get_settings
+from app.database import get_db
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+LOCK_ID = "inquiry_archiver"
+
+
+def pack(docs: list[dict]) -> bytes:
+    return zlib.compress(bson.encode({"items": docs}))
+
+
+def unpack(batch: dict) -> list[dict]:
+    return bson.decode(zlib.decompress(batch["data"]))["items"]
+
+
+async def archive_batch(db, cutoff: datetime) -> int:
+    """Archive one batch of old, read inquiries. Returns how many were moved."""
+    docs = await (
+        db.contact_inquiries.find({"read": True, "created_at": {"$lt": cutoff}})
+        .sort("created_at", 1)
+        .limit(settings.INQUIRY_ARCHIVE_BATCH)
+        .to_list(length=settings.INQUIRY_ARCHIVE_BATCH)
+    )
+    if not docs:
+        return 0
+
+    ids = [d["_id"] for d in docs]
+
+    # Left behind by an interrupted run: already archived, just drop them.
+    archived = await db.contact_inquiries_archive.distinct("ids", {"ids": {"$in": ids}})
+    if archived:
+        await db.contact_inquiries.delete_many({"_id": {"$in": archived}})
+        done = set(archived)
+        docs = [d for d in docs if d["_id"] not in done]
+        ids = [d["_id"] for d in docs]
+        if not docs:
+            return len(archived)
+
+    await db.contact_inquiries_archive.insert_one({
+        "ids": ids,
+        "count": len(docs),
+        "min_created_at": docs[0]["created_at"],
+        "max_created_at": docs[-1]["created_at"],
+        "data": pack(docs),
+        "archived_at": datetime.now(timezone.utc),
+    })
+    await db.contact_inquiries.delete_many({"_id": {"$in": ids}})
+    return len(docs)
+
+
+async def run_archiver() -> int:
+    """Archive everything past the retention window. Returns how many were moved."""
+    db = get_db()
+    lease = timedelta(minutes=10)
+    owner = await locks.acquire(db, LOCK_ID, lease)
+    if owner is None:
+        return 0
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.INQUIRY_RETENTION_DAYS)
+    total = 0
+    try:
+        while True:
+            moved = await archive_batch(db, cutoff)
+            if not moved:
+                break
+            total += moved
+            if not await locks.refresh(db, LOCK_ID, owner, lease):
+                logger.warning("Inquiry archiver lease lost; stopping this run")
+                break
+    finally:
+        await locks.release(db, LOCK_ID, owner)
+    return total
+
+
+async def archiver_loop():
+    """Background task: archive periodically until cancelled."""
+    while True:
+        try:
+            moved = await run_archiver()
+            if moved:
+                logger.info("Archived %d contact inquiries", moved)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Inquiry archiver failed")
+        await asyncio.sleep(settings.INQUIRY_ARCHIVE_INTERVAL)
+
+
+async def iter_archived() -> AsyncIterator[dict]:
+    """Yield archived inquiries, newest batch first."""
+    db = get_db()
+    cursor = db.contact_inquiries_archive.find({}).sort("max_created_at", -1)
+    async for batch in cursor:
+        for doc in reversed(unpack(batch)):
+            yield doc
+
+
+async def find_archived(need: int) -> list[dict]:
+    """The ``need`` newest archived inquiries, sorted by created_at descending.
+
+    Batches are read newest first and reading stops once no remaining batch
+    can contain anything newer than what has been collected.
+    """
+    db = get_db()
+    items: list[dict] = []
+    cursor = db.contact_inquiries_archive.find({}).sort("max_created_at", -1)
+    async for batch in cursor:
+        if len(items) >= need and batch["max_created_at"] < items[need - 1]["created_at"]:
+            break
+        items.extend(unpack(batch))
+        items.sort(key=lambda d: d["created_at"], reverse=True)
+    return items[:need]
+
+
+async def get_archived(inquiry_id) -> Optional[dict]:
+    """One archived inquiry by id, or None if it is not in the archive."""
+    batch = await get_db().contact_inquiries_archive.find_one({"ids": inquiry_id})
+    if batch is None:
+        return None
+    return next((d for d in unpack(batch) if d["_id"] == inquiry_id), None)
+
+
+async def delete_archived(inquiry_id) -> bool:
+    """Remove one inquiry from its archive batch. Returns False if it is not archived.
+
+    The batch is rewritten only if its count is unchanged since it was read, so
+    concurrent deletes from the same batch retry instead of undoing each other.
+    """
+    db = get_db()
+    while True:
+        batch = await db.contact_inquiries_archive.find_one({"ids": inquiry_id})
+        if batch is None:
+            return False
+        match = {"_id": batch["_id"], "count": batch["count"]}
+        docs = [d for d in unpack(batch) if d["_id"] != inquiry_id]
+        if not docs:
+            result = await db.contact_inquiries_archive.delete_one(match)
+            if result.deleted_count:
+                return True
+            continue
+        result = await db.contact_inquiries_archive.update_one(match, {"$set": {
+            "ids": [d["_id"] for d in docs],
+            "count": len(docs),
+            "min_created_at": docs[0]["created_at"],
+            "max_created_at": docs[-1]["created_at"],
+            "data": pack(docs),
+        }})
+        if result.matched_count:
+            return True
+
+
+if __name__ == "__main__":
+    from app.database import connect_db
+
+    async def main():
+        await connect_db()
+        return await run_archiver()
+
+    print(f"✓ Archived {asyncio.run(main())} contact inquiries")
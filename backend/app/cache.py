@@ -0,0 +1,56 @@
+"""Small in-process response caches.
+
+Each cache is registered under a name so write handlers can invalidate it
+without importing the module that reads from it.
+
+Every clear bumps the cache's ``generation``. A reader that notes the
+generation before querying and passes it to ``set`` cannot store a result that
+an invalidation made stale while the query was running.
+"""
+import time
+from typing import Any, Optional
+
+
+class TTLCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: dict[Any, tuple[float, Any]] = {}
+        self.generation = 0
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value, generation: Optional[int] = None):
+        """Store ``value``, unless the cache was cleared since ``generation``."""
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        self._data.clear()
+        self.generation += 1
+
+
+_caches: dict[str, TTLCache] = {}
+
+
+def get_cache(name: str, ttl: float = 60) -> TTLCache:
+    """Return the named cache, creating it on first use."""
+    if name not in _caches:
+        _caches[name] = TTLCache(ttl)
+    return _caches[name]
+
+
+def invalidate(*names: str):
+    """Clear the named caches, or every cache when no names are given."""
+    for name in names or list(_caches):
+        cache = _caches.get(name)
+        if cache is not None:
+            cache.clear()
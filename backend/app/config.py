@@ -6,6 +6,14 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "bedir_group"
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 5  # opened at startup by warm_pool()
+    MONGO_MAX_IDLE_TIME_MS: int = 300_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SOCKET_TIMEOUT_MS: int = 20_000
+    MONGO_COMPRESSORS: str = "zstd,snappy,zlib"  # first one the server supports wins
+    MONGO_READ_PREFERENCE: str = "primary"
 
     # JWT
     SECRET_KEY: str = "bedir-group-secret-key-change-in-production-2024"
@@ -19,6 +27,45 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 10_485_760  # 10 MB
 
+    # Load shedding — max in-flight requests per route class (see app/limits.py)
+    CONCURRENCY_LIMITS: dict[str, int] = {
+        "auth": 8,
+        "upload": 4,
+        "search": 16,
+        "admin": 32,
+        "read": 256,
+    }
+    QUEUE_TIMEOUT: float = 2.0  # seconds to wait for a slot before returning 503
+    RETRY_AFTER_SECONDS: int = 5
+    # Requests per minute per client IP
+    RATE_LIMITS: dict[str, int] = {"login": 10, "inquiry": 5}
+
+    # Local snapshot served when MongoDB is slow or down (see app/snapshot.py)
+    SNAPSHOT_ENABLED: bool = True
+    SNAPSHOT_PATH: str = ""  # defaults to <tempdir>/bedir_snapshot.sqlite3; keep it out of UPLOAD_DIR
+    READ_LATENCY_BUDGET: float = 1.5  # seconds before public reads fall back
+
+    # Contact inquiry retention (see app/archive.py)
+    INQUIRY_RETENTION_DAYS: int = 180  # read inquiries older than this are archived
+    INQUIRY_ARCHIVE_BATCH: int = 500
+    INQUIRY_ARCHIVE_INTERVAL: int = 3600  # seconds between background runs
+    INQUIRY_ARCHIVER: bool = True  # run the archiver from the app lifespan
+
+    # Background jobs (see app/jobs.py)
+    JOB_WORKERS: int = 2  # in-process worker tasks; 0 to run `python -m app.worker` instead
+    JOB_POLL_INTERVAL: float = 1.0  # seconds
+    JOB_LEASE_SECONDS: int = 60
+    JOB_MAX_ATTEMPTS: int = 5
+
+    # Server (python -m app.serve)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 1  # uvicorn worker processes
+
+    # Tail MongoDB change streams to invalidate caches across workers
+    # (requires a replica set; ignored on a standalone server)
+    CACHE_INVALIDATION: bool = True
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
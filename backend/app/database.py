@@ -1,49 +1,206 @@
+import asyncio
+import logging
+import threading
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
 from app.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+INDEX_RETRY_SECONDS = 60
 
 client: AsyncIOMotorClient | None = None
 db: AsyncIOMotorDatabase | None = None
 _indexes_created: bool = False
+_connected: bool = False
+_index_retry: asyncio.Task | None = None
+_client_lock = threading.Lock()
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters for the readiness probe."""
+
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait = 0.0  # seconds, summed over checkouts
+
+    def snapshot(self) -> dict:
+        return {
+            "open": self.open,
+            "in_use": self.in_use,
+            "created": self.created,
+            "closed": self.closed,
+            "checkout_failures": self.checkout_failures,
+            "avg_checkout_ms": (
+                round(self.checkout_wait / self.checkouts * 1000, 3) if self.checkouts else 0
+            ),
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+        }
+
+    def connection_created(self, event):
+        self.open += 1
+        self.created += 1
+
+    def connection_closed(self, event):
+        self.open -= 1
+        self.closed += 1
+
+    def connection_checked_out(self, event):
+        self.in_use += 1
+        self.checkouts += 1
+        self.checkout_wait += getattr(event, "duration", 0) or 0
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    # Not counted
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+pool_stats = PoolStats()
+
+
+def _get_client() -> AsyncIOMotorClient:
+    """The single Motor client for this process, created on first use."""
+    global client, db
+    if client is None:
+        with _client_lock:
+            if client is None:
+                compressors = [c.strip() for c in settings.MONGO_COMPRESSORS.split(",") if c.strip()]
+                client = AsyncIOMotorClient(
+                    settings.MONGODB_URL,
+                    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+                    readPreference=settings.MONGO_READ_PREFERENCE,
+                    event_listeners=[pool_stats],
+                    **({"compressors": compressors} if compressors else {}),
+                )
+                db = client[settings.DATABASE_NAME]
+    return client
+
+
+async def warm_pool():
+    """Open MONGO_MIN_POOL_SIZE connections now instead of on the first requests."""
+    database = get_db()
+    count = max(1, settings.MONGO_MIN_POOL_SIZE)
+    await asyncio.gather(*(database.command("ping") for _ in range(count)))
+
+
+async def _create_indexes() -> bool:
+    """Create all indexes (a no-op for ones that exist). Returns False on failure."""
+    try:
+        await db.users.create_index("email", unique=True)
+        await db.blog_posts.create_index("slug", unique=True)
+        await db.blog_posts.create_index([("status", 1), ("created_at", -1)])
+        await db.blog_posts.create_index(
+            [("created_at", -1)],
+            name="featured_published",
+            partialFilterExpression={"featured": True, "status": "published"},
+        )
+        await db.career_posts.create_index([("status", 1), ("created_at", -1)])
+        await db.contact_inquiries.create_index([("read", 1), ("created_at", -1)])
+        await db.contact_inquiries_archive.create_index("ids")
+        await db.contact_inquiries_archive.create_index([("max_created_at", -1)])
+        await db.jobs.create_index([("status", 1), ("run_at", 1)])
+        await db.jobs.create_index(
+            "idempotency_key",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}},
+        )
+        await db.jobs.create_index(
+            "finished_at",
+            expireAfterSeconds=7 * 24 * 3600,
+            partialFilterExpression={"status": "done"},
+        )
+        return True
+    except Exception:
+        logger.exception("Creating MongoDB indexes failed; retrying in %ss", INDEX_RETRY_SECONDS)
+        return False
+
+
+async def _retry_indexes():
+    global _indexes_created
+    while not _indexes_created:
+        await asyncio.sleep(INDEX_RETRY_SECONDS)
+        _indexes_created = await _create_indexes()
 
 
 async def connect_db():
-    """Connect to MongoDB and create indexes. Safe to call multiple times."""
-    global client, db, _indexes_created
-    if db is not None:
+    """Connect to MongoDB, create indexes and warm the pool. Safe to call multiple times.
+
+    If index creation fails it is retried in the background rather than on
+    every request.
+    """
+    global _indexes_created, _connected, _index_retry
+    if _connected:
         return
 
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
-    db = client[settings.DATABASE_NAME]
+    _get_client()
 
     if not _indexes_created:
-        try:
-            await db.users.create_index("email", unique=True)
-            await db.blog_posts.create_index("slug", unique=True)
-            await db.blog_posts.create_index([("status", 1), ("created_at", -1)])
-            await db.career_posts.create_index([("status", 1), ("created_at", -1)])
-            _indexes_created = True
-        except Exception:
-            pass  # Indexes may already exist
+        _indexes_created = await _create_indexes()
+        if not _indexes_created and (_index_retry is None or _index_retry.done()):
+            _index_retry = asyncio.create_task(_retry_indexes())
+
+    try:
+        await warm_pool()
+    except Exception:
+        pass  # Unreachable right now; /api/ready reports it
 
+    _connected = True
     print(f"✓ Connected to MongoDB: {settings.DATABASE_NAME}")
 
 
 async def close_db():
-    global client, db
+    global client, db, _connected
+    if _index_retry is not None:
+        _index_retry.cancel()
     if client:
         client.close()
         client = None
         db = None
+        _connected = False
         print("✗ Disconnected from MongoDB")
 
 
+def is_connected() -> bool:
+    return _connected
+
+
 def get_db() -> AsyncIOMotorDatabase:
     """Get database instance. Lazily connects if not yet initialized (for serverless)."""
-    global client, db
     if db is None:
         # Lazy connection for serverless environments where lifespan may not fire
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
-        db = client[settings.DATABASE_NAME]
+        _get_client()
     return db
@@ -0,0 +1,257 @@
+"""Sitemap and RSS/Atom feeds served from a stored, incrementally patched artifact.
+
+The ``site_artifacts`` document ``feeds`` holds one small entry per published
+blog post and active career. Write handlers call ``patch``, which sets or
+unsets a single entry and bumps ``version``; nothing is rebuilt from the
+content collections per request. Generated XML is cached
+per version, which doubles as the ETag.
+
+``python -m app.feeds`` rebuilds the artifact from scratch.
+"""
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from xml.etree import ElementTree as ET
+
+from bson import ObjectId
+
+from app.cache import get_cache, invalidate
+from app.config import get_settings
+from app.database import get_db
+from app.models import LOCALES, localized
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+ARTIFACT_ID = "feeds"
+FEED_LIMIT = 50
+SECTIONS = {"blog": "blog_posts", "careers": "career_posts"}
+
+feeds_cache = get_cache("feeds", ttl=300)
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def site_url(path: str, lang: Optional[str] = None) -> str:
+    url = settings.FRONTEND_URL.rstrip("/") + path
+    return f"{url}?lang={lang}" if lang else url
+
+
+# ─── Artifact ──────────────────────────────────────────────
+
+def blog_entry(doc: dict) -> dict:
+    return {
+        "slug": doc.get("slug", ""),
+        "title": doc.get("title", {}),
+        "excerpt": doc.get("excerpt", {}),
+        "published": doc.get("created_at"),
+        "updated": doc.get("updated_at"),
+    }
+
+
+def career_entry(doc: dict) -> dict:
+    return {
+        "title": doc.get("title", {}),
+        "department": doc.get("department", {}),
+        "location": doc.get("location", ""),
+        "published": doc.get("created_at"),
+        "updated": doc.get("updated_at"),
+    }
+
+
+async def rebuild() -> dict:
+    db = get_db()
+    blog = {
+        str(d["_id"]): blog_entry(d)
+        async for d in db.blog_posts.find({"status": "published"}, {"content": 0, "rendered": 0})
+    }
+    careers = {
+        str(d["_id"]): career_entry(d)
+        async for d in db.career_posts.find({"status": "active"})
+    }
+    artifact = {
+        "blog": blog,
+        "careers": careers,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    await db.site_artifacts.update_one(
+        {"_id": ARTIFACT_ID}, {"$set": artifact, "$inc": {"version": 1}}, upsert=True
+    )
+    invalidate("feeds")
+    return await db.site_artifacts.find_one({"_id": ARTIFACT_ID})
+
+
+async def load_artifact() -> dict:
+    artifact = feeds_cache.get("artifact")
+    if artifact is None:
+        generation = feeds_cache.generation
+        artifact = await get_db().site_artifacts.find_one({"_id": ARTIFACT_ID})
+        if artifact is None:
+            artifact = await rebuild()
+            generation = feeds_cache.generation
+        feeds_cache.set("artifact", artifact, generation)
+    return artifact
+
+
+async def patch(section: str, doc_id: str):
+    """Set or remove the artifact entry for one post or career.
+
+    Called after the content write has committed, so errors are logged rather
+    than raised; the next patch or ``python -m app.feeds`` repairs the artifact.
+    """
+    try:
+        await _patch(section, doc_id)
+    except Exception:
+        logger.exception("Could not patch the feeds artifact for %s %s", section, doc_id)
+
+
+async def _patch(section: str, doc_id: str):
+    db = get_db()
+    doc = await db[SECTIONS[section]].find_one({"_id": ObjectId(doc_id)})
+
+    field = f"{section}.{doc_id}"
+    now = datetime.now(timezone.utc)
+    if section == "blog" and doc and doc.get("status") == "published":
+        update = {"$set": {field: blog_entry(doc), "updated_at": now}}
+    elif section == "careers" and doc and doc.get("status") == "active":
+        update = {"$set": {field: career_entry(doc), "updated_at": now}}
+    else:
+        update = {"$unset": {field: ""}, "$set": {"updated_at": now}}
+    update["$inc"] = {"version": 1}
+
+    result = await db.site_artifacts.update_one({"_id": ARTIFACT_ID}, update)
+    if result.matched_count == 0:
+        await rebuild()
+    invalidate("feeds")
+
+
+# ─── XML ───────────────────────────────────────────────────
+
+def _newest(entries: dict, limit: int) -> list[tuple[str, dict]]:
+    return sorted(entries.items(), key=lambda kv: kv[1]["published"], reverse=True)[:limit]
+
+
+def _xml(root: ET.Element) -> bytes:
+    # Namespaces are declared as plain attributes on the root element so tag
+    # names stay unprefixed.
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def render_sitemap(artifact: dict) -> bytes:
+    urlset = ET.Element("urlset", {"xmlns": SITEMAP_NS, "xmlns:xhtml": XHTML_NS})
+
+    def add(path: str, lastmod: Optional[datetime], langs=LOCALES):
+        url = ET.SubElement(urlset, "url")
+        ET.SubElement(url, "loc").text = site_url(path)
+        if lastmod:
+            ET.SubElement(url, "lastmod").text = as_utc(lastmod).date().isoformat()
+        for lang in langs:
+            ET.SubElement(url, "xhtml:link", rel="alternate", hreflang=lang,
+                          href=site_url(path, lang))
+        ET.SubElement(url, "xhtml:link", rel="alternate", hreflang="x-default",
+                      href=site_url(path))
+
+    def latest(entries: dict) -> Optional[datetime]:
+        return max((e["updated"] for e in entries.values()), default=None)
+
+    blog, careers = artifact.get("blog", {}), artifact.get("careers", {})
+    add("/", None)
+    add("/blog", latest(blog))
+    add("/careers", latest(careers))
+    for _, entry in _newest(blog, len(blog)):
+        title = entry.get("title", {})
+        langs = [lang for lang in LOCALES if title.get(lang)] or ["en"]
+        add(f"/blog/{entry['slug']}", entry["updated"], langs)
+    return _xml(urlset)
+
+
+def _items(section: str, artifact: dict, lang: str) -> list[dict]:
+    items = []
+    for doc_id, entry in _newest(artifact.get(section, {}), FEED_LIMIT):
+        if section == "blog":
+            link = site_url(f"/blog/{entry['slug']}", lang)
+            summary = localized(entry.get("excerpt"), lang)
+        else:
+            link = site_url("/careers", lang)
+            summary = " · ".join(
+                p for p in (localized(entry.get("department"), lang), entry.get("location")) if p
+            )
+        items.append({
+            "id": f"{section}:{doc_id}",
+            "title": localized(entry.get("title"), lang),
+            "link": link,
+            "summary": summary,
+            "published": as_utc(entry["published"]),
+            "updated": as_utc(entry["updated"]),
+        })
+    return items
+
+
+def _feed_title(section: str) -> str:
+    return "Bedir Group — " + ("Blog" if section == "blog" else "Careers")
+
+
+def render_rss(section: str, artifact: dict, lang: str) -> bytes:
+    rss = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = _feed_title(section)
+    ET.SubElement(channel, "link").text = site_url(f"/{section}", lang)
+    ET.SubElement(channel, "description").text = _feed_title(section)
+    ET.SubElement(channel, "language").text = lang
+    ET.SubElement(channel, "lastBuildDate").text = format_datetime(as_utc(artifact["updated_at"]))
+    for item in _items(section, artifact, lang):
+        node = ET.SubElement(channel, "item")
+        ET.SubElement(node, "title").text = item["title"]
+        ET.SubElement(node, "link").text = item["link"]
+        ET.SubElement(node, "guid", isPermaLink="false").text = item["id"]
+        ET.SubElement(node, "description").text = item["summary"]
+        ET.SubElement(node, "pubDate").text = format_datetime(item["published"])
+    return _xml(rss)
+
+
+def render_atom(section: str, artifact: dict, lang: str) -> bytes:
+    feed = ET.Element("feed", {"xmlns": ATOM_NS, "xml:lang": lang})
+    ET.SubElement(feed, "id").text = site_url(f"/{section}", lang)
+    ET.SubElement(feed, "title").text = _feed_title(section)
+    ET.SubElement(feed, "updated").text = as_utc(artifact["updated_at"]).isoformat()
+    ET.SubElement(feed, "link", href=site_url(f"/{section}", lang))
+    for item in _items(section, artifact, lang):
+        entry = ET.SubElement(feed, "entry")
+        ET.SubElement(entry, "id").text = f"urn:bedir:{item['id']}"
+        ET.SubElement(entry, "title").text = item["title"]
+        ET.SubElement(entry, "link", href=item["link"])
+        ET.SubElement(entry, "published").text = item["published"].isoformat()
+        ET.SubElement(entry, "updated").text = item["updated"].isoformat()
+        ET.SubElement(entry, "summary").text = item["summary"]
+    return _xml(feed)
+
+
+async def get_document(name: str, render) -> tuple[bytes, dict]:
+    """Rendered XML for ``name`` plus the artifact it came from (cached per version)."""
+    artifact = await load_artifact()
+    key = (name, artifact["version"])
+    body = feeds_cache.get(key)
+    if body is None:
+        body = render(artifact)
+        feeds_cache.set(key, body)
+    return body, artifact
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    from app.database import connect_db
+
+    async def main():
+        await connect_db()
+        return await rebuild()
+
+    artifact = asyncio.run(main())
+    print(f"✓ Rebuilt feeds: {len(artifact['blog'])} posts, {len(artifact['careers'])} careers")
@@ -0,0 +1,119 @@
+"""Cross-process cache invalidation via MongoDB change streams.
+
+Every worker tails one change stream over the collections that feed its
+in-memory caches and clears the affected caches when a document changes, so an
+admin edit handled by one worker (or host) is seen by all of them. The resume
+token is persisted, at most every TOKEN_SAVE_SECONDS, so a restarted watcher
+picks up close to where the last one stopped; replaying a few events only
+repeats invalidations, which is harmless.
+
+Change streams need a replica set (a single-node one is enough); on a
+standalone server the watcher logs once and stays off.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.cache import invalidate
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+
+TOKEN_ID = "cache_invalidation"
+TOKEN_SAVE_SECONDS = 10  # every worker sees the same events, so one save per interval is plenty
+
+# Collection -> names of caches (see app/cache.py) built from it
+COLLECTION_CACHES: dict[str, tuple[str, ...]] = {
+    "blog_posts": ("home",),
+    "career_posts": ("home",),
+    "users": (),
+    "site_artifacts": ("feeds",),
+}
+
+# Error codes meaning change streams are not available on this deployment
+_UNSUPPORTED = {40573, 40324}  # not a replica set / unrecognized $changeStream
+_HISTORY_LOST = {286, 280}  # ChangeStreamHistoryLost / ChangeStreamFatalError
+
+_listeners: dict[str, list[Callable[[dict], None]]] = {}
+
+
+def add_listener(collection: str, callback: Callable[[dict], None]):
+    """Call ``callback(change)`` for every change to ``collection``.
+
+    For state that is not a plain TTL cache, e.g. an index that can be patched
+    from the change event instead of being dropped.
+    """
+    _listeners.setdefault(collection, []).append(callback)
+
+
+def dispatch(collection: str, change: dict):
+    caches = COLLECTION_CACHES.get(collection, ())
+    if caches:
+        invalidate(*caches)
+    for callback in _listeners.get(collection, []):
+        try:
+            callback(change)
+        except Exception:
+            logger.exception("Invalidation listener failed for %s", collection)
+
+
+async def _load_token():
+    state = await get_db().change_stream_tokens.find_one({"_id": TOKEN_ID})
+    return state.get("token") if state else None
+
+
+async def _save_token(token):
+    await get_db().change_stream_tokens.update_one(
+        {"_id": TOKEN_ID},
+        {"$set": {"token": token, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+
+
+async def watch_changes():
+    """Tail the change stream until cancelled."""
+    db = get_db()
+    pipeline = [{"$match": {"ns.coll": {"$in": list(COLLECTION_CACHES)}}}]
+    token, loaded = None, False
+    saved_at = 0.0
+    backoff = 1
+
+    while True:
+        try:
+            if not loaded:
+                token, loaded = await _load_token(), True
+            async with db.watch(pipeline, resume_after=token) as stream:
+                backoff = 1
+                async for change in stream:
+                    dispatch(change["ns"]["coll"], change)
+                    token = stream.resume_token
+                    if time.monotonic() - saved_at >= TOKEN_SAVE_SECONDS:
+                        await _save_token(token)
+                        saved_at = time.monotonic()
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            if e.code in _UNSUPPORTED:
+                logger.warning("Change streams unavailable; cache invalidation is process-local")
+                return
+            if e.code in _HISTORY_LOST:
+                # Events were missed: drop everything and start from now.
+                logger.warning("Change stream history lost; clearing all caches")
+                invalidate()
+                for collection in COLLECTION_CACHES:
+                    dispatch(collection, {"operationType": "invalidate"})
+                token = None
+                continue
+            logger.exception("Change stream failed; retrying in %ss", backoff)
+        except PyMongoError:
+            logger.exception("Change stream failed; retrying in %ss", backoff)
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 30)
+
+
+def start_watcher() -> asyncio.Task:
+    return asyncio.create_task(watch_changes())
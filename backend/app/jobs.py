@@ -0,0 +1,250 @@
+"""Durable background jobs for work that should not slow down admin requests.
+
+Jobs live in the ``jobs`` collection. Workers claim one at a time with a lease
+(``lease_until``) and keep extending it while the handler runs, so a slow job is
+not handed to a second worker; a job whose worker dies is picked up again once
+the lease expires. Failures are retried with exponential backoff up to
+JOB_MAX_ATTEMPTS. An optional idempotency key makes enqueueing the same work
+twice a no-op.
+
+Workers run inside the app (JOB_WORKERS tasks started from the lifespan) or
+standalone with ``python -m app.worker``. A process without workers (e.g. a
+serverless function, where JOB_WORKERS is 0) drains the queue itself after
+sending the response to a request that enqueued work; see drain_after_response.
+Handlers are registered with ``@job`` in app/tasks.py.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from fastapi import BackgroundTasks
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.config import get_settings
+from app.database import get_db
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+MAX_BACKOFF = 600  # seconds
+
+Handler = Callable[[dict], Awaitable[None]]
+_handlers: dict[str, Handler] = {}
+_wakeup: Optional[asyncio.Event] = None
+
+# Process-local counters, reported by metrics()
+_stats = {"processed": 0, "failed": 0, "retried": 0, "run_seconds": 0.0}
+
+
+def job(name: str):
+    """Register an async handler for jobs of type ``name``."""
+    def decorator(fn: Handler) -> Handler:
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue(
+    name: str,
+    payload: dict,
+    idempotency_key: Optional[str] = None,
+    delay: float = 0,
+):
+    """Queue a job and return its id (or the existing job's id for a repeated key)."""
+    db = get_db()
+    now = _now()
+    doc = {
+        "type": name,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "run_at": now + timedelta(seconds=delay),
+        "created_at": now,
+    }
+    if idempotency_key:
+        doc["idempotency_key"] = idempotency_key
+    try:
+        result = await db.jobs.insert_one(doc)
+    except DuplicateKeyError:
+        existing = await db.jobs.find_one({"idempotency_key": idempotency_key}, {"_id": 1})
+        return existing["_id"]
+    if _wakeup is not None:
+        _wakeup.set()
+    return result.inserted_id
+
+
+async def _claim(db) -> Optional[dict]:
+    now = _now()
+    return await db.jobs.find_one_and_update(
+        {
+            "$or": [
+                {"status": "queued", "run_at": {"$lte": now}},
+                {"status": "running", "lease_until": {"$lt": now}},
+            ]
+        },
+        {
+            "$set": {
+                "status": "running",
+                "worker": WORKER_ID,
+                "started_at": now,
+                "lease_until": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _owned(doc: dict) -> dict:
+    # attempts changes on every claim, so a reclaimed job no longer matches
+    return {"_id": doc["_id"], "worker": WORKER_ID, "attempts": doc["attempts"]}
+
+
+async def _renew_lease(db, doc: dict):
+    """Extend the lease every third of JOB_LEASE_SECONDS until cancelled."""
+    while True:
+        await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+        try:
+            await db.jobs.update_one(
+                {**_owned(doc), "status": "running"},
+                {"$set": {"lease_until": _now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)}},
+            )
+        except PyMongoError:
+            logger.warning("Could not renew the lease on job %s", doc["_id"], exc_info=True)
+
+
+async def _run(db, doc: dict):
+    handler = _handlers.get(doc["type"])
+    started = time.monotonic()
+    renewal = asyncio.create_task(_renew_lease(db, doc))
+    try:
+        if handler is None:
+            raise LookupError(f"No handler for job type {doc['type']!r}")
+        await handler(doc["payload"])
+    except Exception:
+        error = traceback.format_exc(limit=5)
+        if doc["attempts"] < settings.JOB_MAX_ATTEMPTS and handler is not None:
+            backoff = min(MAX_BACKOFF, 2 ** doc["attempts"])
+            update = {"status": "queued", "run_at": _now() + timedelta(seconds=backoff)}
+            _stats["retried"] += 1
+        else:
+            update = {"status": "failed", "finished_at": _now()}
+            _stats["failed"] += 1
+            logger.error("Job %s (%s) failed permanently:\n%s", doc["_id"], doc["type"], error)
+        update["error"] = error
+        await db.jobs.update_one(
+            _owned(doc),
+            {"$set": update, "$unset": {"lease_until": ""}},
+        )
+        return
+    finally:
+        renewal.cancel()
+        _stats["run_seconds"] += time.monotonic() - started
+
+    _stats["processed"] += 1
+    await db.jobs.update_one(
+        _owned(doc),
+        {"$set": {"status": "done", "finished_at": _now()}, "$unset": {"lease_until": ""}},
+    )
+
+
+async def work(drain: bool = False):
+    """Process jobs until cancelled (or, with ``drain``, until none are ready)."""
+    db = get_db()
+    backoff = 1
+    while True:
+        try:
+            doc = await _claim(db)
+            if doc is not None:
+                await _run(db, doc)
+                backoff = 1
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # MongoDB unreachable; an unfinished job is reclaimed when its lease expires
+            if drain:
+                raise
+            logger.exception("Job worker failed; retrying in %ss", backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+            continue
+        if drain:
+            return
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+
+def start_workers(count: int) -> list[asyncio.Task]:
+    global _wakeup
+    if count <= 0:
+        return []
+    _wakeup = asyncio.Event()
+    return [asyncio.create_task(work()) for _ in range(count)]
+
+
+def drain_after_response(background: BackgroundTasks):
+    """If this process runs no workers, process ready jobs once the response is sent."""
+    if _wakeup is None:
+        background.add_task(_drain)
+
+
+async def _drain():
+    try:
+        await work(drain=True)
+    except Exception:
+        logger.exception("Draining jobs after the response failed")
+
+
+async def metrics() -> dict:
+    """Queue depth per status, age of the oldest ready job and local counters."""
+    db = get_db()
+    depth = {
+        row["_id"]: row["count"]
+        async for row in db.jobs.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+    }
+    oldest = await db.jobs.find_one(
+        {"status": "queued", "run_at": {"$lte": _now()}}, {"run_at": 1}, sort=[("run_at", 1)]
+    )
+    lag = 0.0
+    if oldest:
+        run_at = oldest["run_at"].replace(tzinfo=timezone.utc)
+        lag = (_now() - run_at).total_seconds()
+
+    latency = None
+    recent = db.jobs.find(
+        {"status": "done"}, {"created_at": 1, "finished_at": 1}
+    ).sort("finished_at", -1).limit(100)
+    durations = [
+        (d["finished_at"] - d["created_at"]).total_seconds() async for d in recent
+    ]
+    if durations:
+        latency = sum(durations) / len(durations)
+
+    ran = _stats["processed"] + _stats["failed"] + _stats["retried"]
+    return {
+        "depth": depth,
+        "oldest_ready_seconds": lag,
+        "avg_latency_seconds": latency,  # enqueue -> done, last 100 jobs
+        "worker": {
+            "id": WORKER_ID,
+            **{k: v for k, v in _stats.items() if k != "run_seconds"},
+            "avg_run_seconds": _stats["run_seconds"] / ran if ran else None,
+        },
+    }
+
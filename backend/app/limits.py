@@ -0,0 +1,139 @@
+"""Per-route-class concurrency limits and per-IP rate limiting.
+
+Requests are sorted into classes (auth, upload, search, admin, read), each with
+its own semaphore. A request that cannot get a slot within the queue timeout is
+shed with 503 + Retry-After, so bursts of expensive work (bcrypt, regex scans,
+uploads) cannot starve cheap public reads.
+"""
+import asyncio
+import json
+import math
+import time
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# (method, path) pairs limited per client IP by RATE_LIMITS
+RATE_LIMITED_ROUTES = {
+    ("POST", "/api/auth/login"): "login",
+    ("POST", "/api/contact/inquiries"): "inquiry",
+}
+# Routes that hash a password; the rest of /api/auth is as cheap as any read
+PASSWORD_ROUTES = {"/api/auth/login", "/api/auth/register"}
+# Probes must answer even when every class is saturated
+EXEMPT_PATHS = {"/api/health", "/api/ready"}
+MAX_BUCKETS = 10_000
+
+
+def classify(method: str, path: str, query_string: bytes) -> str:
+    if path in PASSWORD_ROUTES:
+        return "auth"
+    if path.endswith("/upload-image"):
+        return "upload"
+    if b"search=" in query_string:
+        return "search"
+    if "/admin/" in path:
+        return "admin"
+    return "read"
+
+
+def client_ip(scope) -> str:
+    """Client address as resolved by the server.
+
+    Behind a proxy, uvicorn's proxy-headers support replaces it with the
+    X-Forwarded-For address, but only for peers in FORWARDED_ALLOW_IPS (see
+    app/serve.py); the header itself is never trusted here.
+    """
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class TokenBucket:
+    """Token buckets keyed by client, refilled continuously."""
+
+    def __init__(self, rate_per_minute: int, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str) -> float:
+        """Consume a token. Returns 0 on success, else seconds until one is free."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= 1:
+            self._set(key, tokens - 1, now)
+            return 0
+        self._set(key, tokens, now)
+        return (1 - tokens) / self.rate
+
+    def _set(self, key: str, tokens: float, now: float):
+        if key not in self._buckets and len(self._buckets) >= MAX_BUCKETS:
+            # Drop buckets that have refilled completely; they carry no state.
+            self._buckets = {
+                k: (t, ts) for k, (t, ts) in self._buckets.items()
+                if t + (now - ts) * self.rate < self.burst
+            }
+        self._buckets[key] = (tokens, now)
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.queue_timeout = settings.QUEUE_TIMEOUT
+        self.semaphores = {
+            name: asyncio.Semaphore(limit)
+            for name, limit in settings.CONCURRENCY_LIMITS.items()
+        }
+        self.buckets = {
+            name: TokenBucket(per_minute, burst=max(1, per_minute // 2))
+            for name, per_minute in settings.RATE_LIMITS.items()
+        }
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            return await self.app(scope, receive, send)
+
+        method, path = scope["method"], scope["path"]
+
+        bucket_name = RATE_LIMITED_ROUTES.get((method, path))
+        bucket = self.buckets.get(bucket_name) if bucket_name else None
+        if bucket is not None:
+            wait = bucket.take(client_ip(scope))
+            if wait:
+                return await self.reject(send, 429, "Too many requests", wait)
+
+        route_class = classify(method, path, scope.get("query_string", b""))
+        semaphore = self.semaphores.get(route_class)
+        if semaphore is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            return await self.reject(
+                send, 503, "Server busy, please retry", settings.RETRY_AFTER_SECONDS
+            )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            semaphore.release()
+
+    @staticmethod
+    async def reject(send, status: int, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,39 @@
+"""Leases in the ``locks`` collection, so only one process runs a task at a time.
+
+A lease expires on its own if its holder dies. Each acquisition gets a random
+owner token; refreshing and releasing match on it, so a holder whose lease ran
+out cannot extend or drop the lease of whoever took over.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+
+async def acquire(db, lock_id: str, ttl: timedelta) -> Optional[str]:
+    """Take the lease. Returns the owner token, or None if someone else holds it."""
+    now = datetime.now(timezone.utc)
+    owner = uuid.uuid4().hex
+    try:
+        await db.locks.update_one(
+            {"_id": lock_id, "expires_at": {"$lt": now}},
+            {"$set": {"expires_at": now + ttl, "owner": owner}},
+            upsert=True,
+        )
+        return owner
+    except DuplicateKeyError:
+        return None  # held by someone else
+
+
+async def refresh(db, lock_id: str, owner: str, ttl: timedelta) -> bool:
+    """Extend our lease. False if it expired and another process took over."""
+    result = await db.locks.update_one(
+        {"_id": lock_id, "owner": owner},
+        {"$set": {"expires_at": datetime.now(timezone.utc) + ttl}},
+    )
+    return result.matched_count == 1
+
+
+async def release(db, lock_id: str, owner: str):
+    await db.locks.delete_one({"_id": lock_id, "owner": owner})
@@ -1,24 +1,54 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
+import time
 
 from app.config import get_settings
-from app.database import connect_db, close_db
+from app.database import connect_db, close_db, get_db, is_connected, pool_stats
+from app.limits import LoadSheddingMiddleware
+from app.invalidation import start_watcher
+from app.archive import archiver_loop
 from app.routes.auth import router as auth_router
 from app.routes.blog import router as blog_router
 from app.routes.careers import router as careers_router
 from app.routes.contact import router as contact_router
+from app.routes.home import router as home_router
+from app.routes.search import router as search_router
+from app.routes.jobs import router as jobs_router
+from app.routes.feeds import router as feeds_router
+from app.search import suggestion_index
+from app import snapshot
+from app.jobs import start_workers
+from app import tasks  # noqa: F401  (registers job handlers)
 
 settings = get_settings()
 
+READY_TIMEOUT = 2.0  # seconds
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_db()
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    try:
+        await suggestion_index.build()
+    except Exception:
+        pass  # Built lazily on the first suggestion request instead
+    background = []
+    if settings.CACHE_INVALIDATION:
+        background.append(start_watcher())
+    if settings.INQUIRY_ARCHIVER:
+        background.append(asyncio.create_task(archiver_loop()))
+    background += start_workers(settings.JOB_WORKERS)
+    snapshot.schedule_refresh()
     yield
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
     await close_db()
 
 
@@ -41,6 +71,10 @@ origins = [
 if settings.FRONTEND_URL and ".vercel.app" in settings.FRONTEND_URL:
     origins.append("https://*.vercel.app")
 
+# Per-route-class concurrency limits and per-IP rate limits (inside CORS so
+# rejections still carry CORS headers)
+app.add_middleware(LoadSheddingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -48,6 +82,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[snapshot.STALE_HEADER],
 )
 
 # Static files (uploaded images) — only mount if directory exists (skipped in serverless)
@@ -62,6 +97,10 @@ app.include_router(auth_router)
 app.include_router(blog_router)
 app.include_router(careers_router)
 app.include_router(contact_router)
+app.include_router(home_router)
+app.include_router(search_router)
+app.include_router(jobs_router)
+app.include_router(feeds_router)
 
 
 @app.get("/api/health")
@@ -69,10 +108,31 @@ async def health_check():
     return {"status": "ok", "service": "Bedir Group API"}
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Ready only if MongoDB answers a ping; includes connection pool stats.
+
+    For orchestrators that separate readiness from liveness; platform health
+    checks use /api/health so a MongoDB outage does not restart the service.
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(get_db().command("ping"), timeout=READY_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": type(e).__name__, "pool": pool_stats.snapshot()},
+        )
+    return {
+        "status": "ready",
+        "mongo_ping_ms": round((time.perf_counter() - started) * 1000, 2),
+        "pool": pool_stats.snapshot(),
+    }
+
+
 # Ensure DB connection on first request (for serverless where lifespan may not fire)
 @app.middleware("http")
 async def ensure_db_connection(request, call_next):
-    from app.database import db as _db, connect_db as _connect
-    if _db is None:
-        await _connect()
+    if not is_connected():
+        await connect_db()
     return await call_next(request)
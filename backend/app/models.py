@@ -53,6 +53,16 @@ class LocalizedText(BaseModel):
     de: str = ""
 
 
+LOCALES = tuple(LocalizedText.model_fields)  # ("en", "ar", "fr", "de")
+
+
+def localized(value, lang: str) -> str:
+    """``value[lang]``, falling back to English; plain strings pass through."""
+    if not isinstance(value, dict):
+        return value or ""
+    return value.get(lang) or value.get("en") or ""
+
+
 class BlogPostBase(BaseModel):
     title: LocalizedText = LocalizedText()
     excerpt: LocalizedText = LocalizedText()
@@ -72,17 +82,43 @@ class BlogPostUpdate(BlogPostBase):
     pass
 
 
+class TocEntry(BaseModel):
+    level: int
+    text: str
+    id: str
+
+
+class RenderedContent(BaseModel):
+    html: str = ""
+    word_count: int = 0
+    reading_time: int = 0  # minutes
+    toc: list[TocEntry] = []
+    first_image: str = ""
+    text_excerpt: str = ""
+
+
+class RenderedSummary(BaseModel):
+    """The part of RenderedContent that list responses carry."""
+    reading_time: int = 0  # minutes
+    text_excerpt: str = ""
+
+
 class BlogPostOut(BlogPostBase):
     id: str
     slug: str
     author_id: str
     author_name: str
+    rendered: dict[str, RenderedContent] = {}  # keyed by locale
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class BlogPostSummaryOut(BlogPostOut):
+    rendered: dict[str, RenderedSummary] = {}  # keyed by locale
+
+
 # ─── Careers ───────────────────────────────────────────────
 
 class CareerStatus(str, Enum):
@@ -119,6 +155,43 @@ class CareerPostOut(CareerPostBase):
     model_config = {"from_attributes": True}
 
 
+# ─── Home ──────────────────────────────────────────────────
+
+class HomeBlogPost(BaseModel):
+    id: str
+    slug: str
+    title: str
+    excerpt: str
+    cover_image: str = ""
+    category: str = ""
+    featured: bool = False
+    reading_time: int = 0
+    created_at: datetime
+
+
+class HomeCareer(BaseModel):
+    id: str
+    title: str
+    department: str
+    location: str = ""
+    job_type: str = "full-time"
+    created_at: datetime
+
+
+class HomeOut(BaseModel):
+    featured_posts: list[HomeBlogPost]
+    latest_posts: list[HomeBlogPost]
+    careers: list[HomeCareer]
+
+
+# ─── Search ────────────────────────────────────────────────
+
+class Suggestion(BaseModel):
+    text: str
+    kind: str  # blog | tag | career | department | location
+    ref: str = ""  # blog slug or career id
+
+
 # ─── Contact Inquiries ─────────────────────────────────────
 
 class ContactInquiryCreate(BaseModel):
@@ -135,6 +208,7 @@ class ContactInquiryCreate(BaseModel):
 class ContactInquiryOut(ContactInquiryCreate):
     id: str
     read: bool = False
+    archived: bool = False
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -0,0 +1,304 @@
+"""Server-side rendering of TipTap JSON blog content.
+
+Posts are rendered once when they are written instead of on every view. The
+renderer only emits whitelisted tags and attributes, so the stored HTML is safe
+to inject directly on the client.
+
+Run ``python -m app.rendering`` to backfill posts written before rendering
+existed (or rendered by an older RENDER_VERSION).
+"""
+import hashlib
+import html
+import json
+import re
+from typing import Optional
+
+from app.models import LOCALES
+
+# Bump when the HTML output changes so the backfill re-renders stored posts.
+RENDER_VERSION = 2
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 200
+SUMMARY_FIELDS = ("reading_time", "text_excerpt")  # what list responses carry
+
+# Same classes the TipTap extensions add in src/pages/BlogPost.tsx; keep in sync
+IMAGE_CLASS = "rounded-xl max-w-full mx-auto my-6 shadow-md"
+LINK_CLASS = "text-gold underline"
+HIGHLIGHT_CLASS = "bg-gold/30 px-1 rounded"
+
+_SAFE_URL = re.compile(r"^(https?:|mailto:|tel:|/|#)", re.IGNORECASE)
+_SAFE_COLOR = re.compile(r"^(#[0-9a-fA-F]{3,8}|rgba?\([\d\s.,%]+\)|[a-zA-Z]+)$")
+_ALIGNMENTS = {"left", "center", "right", "justify"}
+
+_BLOCK_TAGS = {
+    "paragraph": "p",
+    "blockquote": "blockquote",
+    "bulletList": "ul",
+    "orderedList": "ol",
+    "listItem": "li",
+}
+_MARK_TAGS = {
+    "bold": "strong",
+    "italic": "em",
+    "underline": "u",
+    "strike": "s",
+    "code": "code",
+}
+
+
+def _attr(value: str) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _safe_url(url) -> Optional[str]:
+    if not isinstance(url, str):
+        return None
+    url = url.strip()
+    return url if _SAFE_URL.match(url) else None
+
+
+def _align_style(attrs: dict) -> str:
+    align = attrs.get("textAlign")
+    if align in _ALIGNMENTS and align != "left":
+        return f' style="text-align: {align}"'
+    return ""
+
+
+def _slugify(text: str) -> str:
+    slug = re.sub(r"[^\w\s-]", "", text.lower()).strip()
+    return re.sub(r"[\s_-]+", "-", slug)[:80].strip("-") or "section"
+
+
+def _node_text(node: dict) -> str:
+    if node.get("type") == "text":
+        return node.get("text", "")
+    if node.get("type") == "hardBreak":
+        return " "
+    return "".join(_node_text(c) for c in node.get("content", []) if isinstance(c, dict))
+
+
+def _node_hash(node: dict) -> str:
+    raw = json.dumps(node, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# ─── HTML ──────────────────────────────────────────────────
+
+def _render_marks(text: str, marks: list) -> str:
+    out = html.escape(text, quote=False)
+    for mark in marks:
+        if not isinstance(mark, dict):
+            continue
+        kind = mark.get("type")
+        attrs = mark.get("attrs") or {}
+        if kind in _MARK_TAGS:
+            tag = _MARK_TAGS[kind]
+            out = f"<{tag}>{out}</{tag}>"
+        elif kind == "link":
+            href = _safe_url(attrs.get("href"))
+            if href:
+                out = (
+                    f'<a href="{_attr(href)}" target="_blank" '
+                    f'rel="noopener noreferrer nofollow" class="{LINK_CLASS}">{out}</a>'
+                )
+        elif kind == "highlight":
+            color = attrs.get("color")
+            if isinstance(color, str) and _SAFE_COLOR.match(color):
+                out = (
+                    f'<mark class="{HIGHLIGHT_CLASS}" '
+                    f'style="background-color: {color}">{out}</mark>'
+                )
+            else:
+                out = f'<mark class="{HIGHLIGHT_CLASS}">{out}</mark>'
+        elif kind == "textStyle":
+            color = attrs.get("color")
+            if isinstance(color, str) and _SAFE_COLOR.match(color):
+                out = f'<span style="color: {color}">{out}</span>'
+    return out
+
+
+def _render_children(node: dict, heading_ids: dict) -> str:
+    return "".join(
+        _render_node(c, heading_ids) for c in node.get("content", []) if isinstance(c, dict)
+    )
+
+
+def _render_node(node: dict, heading_ids: dict) -> str:
+    kind = node.get("type")
+    attrs = node.get("attrs") or {}
+
+    if kind == "text":
+        return _render_marks(node.get("text", ""), node.get("marks", []))
+    if kind == "hardBreak":
+        return "<br>"
+    if kind == "horizontalRule":
+        return "<hr>"
+    if kind == "image":
+        src = _safe_url(attrs.get("src"))
+        if not src:
+            return ""
+        alt = _attr(attrs.get("alt") or "")
+        title = f' title="{_attr(attrs["title"])}"' if attrs.get("title") else ""
+        return f'<img src="{_attr(src)}" alt="{alt}"{title} class="{IMAGE_CLASS}" loading="lazy">'
+    if kind == "heading":
+        level = attrs.get("level") if attrs.get("level") in (1, 2, 3, 4, 5, 6) else 2
+        anchor = heading_ids.get(id(node), "")
+        id_attr = f' id="{_attr(anchor)}"' if anchor else ""
+        inner = _render_children(node, heading_ids)
+        return f"<h{level}{id_attr}{_align_style(attrs)}>{inner}</h{level}>"
+    if kind == "codeBlock":
+        lang = attrs.get("language")
+        cls = f' class="language-{_attr(lang)}"' if isinstance(lang, str) and lang.isalnum() else ""
+        return f"<pre><code{cls}>{html.escape(_node_text(node), quote=False)}</code></pre>"
+    if kind == "orderedList":
+        start = attrs.get("start")
+        start_attr = f' start="{start}"' if isinstance(start, int) and start != 1 else ""
+        return f"<ol{start_attr}>{_render_children(node, heading_ids)}</ol>"
+    if kind in _BLOCK_TAGS:
+        tag = _BLOCK_TAGS[kind]
+        style = _align_style(attrs) if kind == "paragraph" else ""
+        return f"<{tag}{style}>{_render_children(node, heading_ids)}</{tag}>"
+    # Unknown node types: keep their text content, drop the wrapper.
+    return _render_children(node, heading_ids)
+
+
+# ─── Document ──────────────────────────────────────────────
+
+def _collect(node: dict, headings: list, images: list):
+    kind = node.get("type")
+    if kind == "heading":
+        headings.append(node)
+    elif kind == "image" and _safe_url((node.get("attrs") or {}).get("src")):
+        images.append(node["attrs"]["src"])
+    for child in node.get("content", []):
+        if isinstance(child, dict):
+            _collect(child, headings, images)
+
+
+def render_document(doc: dict, previous: Optional[dict] = None) -> dict:
+    """Render a single TipTap document to HTML plus derived metadata.
+
+    ``previous`` is an earlier result of this function for the same post. Top
+    level blocks whose JSON is unchanged (and whose heading anchors are the
+    same) reuse the previously rendered HTML instead of being rendered again.
+    """
+    blocks = [b for b in doc.get("content", []) if isinstance(b, dict)]
+
+    headings: list = []
+    images: list = []
+    for block in blocks:
+        _collect(block, headings, images)
+
+    toc = []
+    heading_ids: dict = {}
+    seen: dict[str, int] = {}
+    for heading in headings:
+        text = _node_text(heading).strip()
+        anchor = _slugify(text)
+        if anchor in seen:
+            seen[anchor] += 1
+            anchor = f"{anchor}-{seen[anchor]}"
+        else:
+            seen[anchor] = 0
+        heading_ids[id(heading)] = anchor
+        level = (heading.get("attrs") or {}).get("level", 2)
+        toc.append({"level": level, "text": text, "id": anchor})
+
+    cache = {}
+    if previous and previous.get("version") == RENDER_VERSION:
+        cache = {b["hash"]: b["html"] for b in previous.get("blocks", [])}
+
+    rendered_blocks = []
+    for block in blocks:
+        # Heading anchors depend on earlier headings, so they are part of the key.
+        key = _node_hash(block)
+        block_headings = []
+        _collect(block, block_headings, [])
+        if block_headings:
+            key += ":" + ",".join(heading_ids[id(h)] for h in block_headings)
+        block_html = cache.get(key)
+        if block_html is None:
+            block_html = _render_node(block, heading_ids)
+        rendered_blocks.append({"hash": key, "html": block_html})
+
+    text = " ".join(_node_text(b) for b in blocks)
+    words = text.split()
+    word_count = len(words)
+    excerpt = " ".join(words)
+    if len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rsplit(" ", 1)[0] + "…"
+
+    return {
+        "version": RENDER_VERSION,
+        "html": "".join(b["html"] for b in rendered_blocks),
+        "blocks": rendered_blocks,
+        "word_count": word_count,
+        "reading_time": max(1, round(word_count / WORDS_PER_MINUTE)) if word_count else 0,
+        "toc": toc,
+        "first_image": images[0] if images else "",
+        "text_excerpt": excerpt,
+    }
+
+
+def render_content(content: Optional[dict], previous: Optional[dict] = None) -> dict:
+    """Render post content for every locale it has.
+
+    Content is either a single TipTap document (stored under ``en``, which the
+    frontend already uses as its fallback locale) or a mapping of locale to
+    document. Returns ``{locale: rendered}``.
+    """
+    if not isinstance(content, dict):
+        return {}
+    previous = previous or {}
+
+    if content.get("type") == "doc":
+        docs = {"en": content}
+    else:
+        docs = {
+            loc: content[loc]
+            for loc in LOCALES
+            if isinstance(content.get(loc), dict) and content[loc].get("type") == "doc"
+        }
+
+    return {loc: render_document(doc, previous.get(loc)) for loc, doc in docs.items()}
+
+
+def public_rendered(rendered: Optional[dict], summary: bool = False) -> dict:
+    """Strip the per-block render cache from stored output before returning it.
+
+    With ``summary``, keep only the SUMMARY_FIELDS that list views use.
+    """
+    def keep(key: str) -> bool:
+        return key in SUMMARY_FIELDS if summary else key not in ("blocks", "version")
+
+    return {loc: {k: v for k, v in r.items() if keep(k)} for loc, r in (rendered or {}).items()}
+
+
+# ─── Backfill ──────────────────────────────────────────────
+
+async def backfill(force: bool = False) -> int:
+    """Render every post whose stored output is missing or out of date."""
+    from app.database import connect_db, get_db
+
+    await connect_db()
+    db = get_db()
+    query: dict = {} if force else {"rendered_version": {"$ne": RENDER_VERSION}}
+
+    count = 0
+    async for post in db.blog_posts.find(query, {"content": 1, "rendered": 1}):
+        rendered = render_content(post.get("content"), None if force else post.get("rendered"))
+        await db.blog_posts.update_one(
+            {"_id": post["_id"]},
+            {"$set": {"rendered": rendered, "rendered_version": RENDER_VERSION}},
+        )
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    total = asyncio.run(backfill(force="--force" in sys.argv))
+    print(f"✓ Rendered {total} blog posts")
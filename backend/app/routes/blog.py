@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, UploadFile, File, Query
 from fastapi.responses import Response
 from datetime import datetime, timezone
 from typing import Optional
@@ -12,11 +12,20 @@ from app.models import (
     BlogPostCreate,
     BlogPostUpdate,
     BlogPostOut,
+    BlogPostSummaryOut,
     BlogStatus,
 )
 from app.auth import get_current_user, get_admin_user
 from app.database import get_db
+from app.cache import invalidate
+from app.search import suggestion_index
+from app import snapshot
 from app.config import get_settings
+from app.models import LOCALES
+from app.rendering import RENDER_VERSION, public_rendered
+from app.jobs import drain_after_response
+from app.tasks import enqueue_render
+from app import feeds
 
 settings = get_settings()
 router = APIRouter(prefix="/api/blog", tags=["Blog"])
@@ -30,8 +39,16 @@ def generate_slug(title: str) -> str:
     return slug[:80].strip("-")
 
 
-def doc_to_out(doc: dict) -> BlogPostOut:
-    return BlogPostOut(
+# List queries skip the heavy render output; doc_to_out keeps only the summary
+LIST_PROJECTION = {
+    f"rendered.{loc}.{field}": 0 for loc in LOCALES for field in ("html", "toc", "blocks")
+}
+
+
+def doc_to_out(doc: dict, full: bool = False) -> BlogPostOut:
+    """API form of a post; lists (not ``full``) get BlogPostSummaryOut."""
+    model = BlogPostOut if full else BlogPostSummaryOut
+    return model(
         id=str(doc["_id"]),
         title=doc.get("title", {}),
         excerpt=doc.get("excerpt", {}),
@@ -44,6 +61,11 @@ def doc_to_out(doc: dict) -> BlogPostOut:
         slug=doc.get("slug", ""),
         author_id=doc.get("author_id", ""),
         author_name=doc.get("author_name", ""),
+        # Hidden while a re-render is pending so it never disagrees with content
+        rendered=(
+            public_rendered(doc.get("rendered"), summary=not full)
+            if doc.get("rendered_version") == RENDER_VERSION else {}
+        ),
         created_at=doc.get("created_at", datetime.now(timezone.utc)),
         updated_at=doc.get("updated_at", datetime.now(timezone.utc)),
     )
@@ -51,8 +73,9 @@ def doc_to_out(doc: dict) -> BlogPostOut:
 
 # ─── Public endpoints ─────────────────────────────────────
 
-@router.get("/posts", response_model=list[BlogPostOut])
+@router.get("/posts", response_model=list[BlogPostSummaryOut])
 async def get_published_posts(
+    response: Response,
     category: Optional[str] = None,
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
@@ -73,23 +96,43 @@ async def get_published_posts(
         ]
 
     skip = (page - 1) * limit
-    cursor = db.blog_posts.find(query).sort("created_at", -1).skip(skip).limit(limit)
-    posts = await cursor.to_list(length=limit)
-    return [doc_to_out(p) for p in posts]
+
+    async def from_db():
+        cursor = (
+            db.blog_posts.find(query, LIST_PROJECTION).sort("created_at", -1).skip(skip).limit(limit)
+        )
+        posts = await cursor.to_list(length=limit)
+        return [doc_to_out(p) for p in posts]
+
+    return await snapshot.read_with_fallback(
+        response,
+        from_db(),
+        lambda: snapshot.blog_posts(category=category, search=search, skip=skip, limit=limit),
+    )
 
 
 @router.get("/posts/{slug}", response_model=BlogPostOut)
-async def get_post_by_slug(slug: str):
+async def get_post_by_slug(slug: str, response: Response):
     db = get_db()
-    post = await db.blog_posts.find_one({"slug": slug, "status": "published"})
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    return doc_to_out(post)
+
+    async def from_db():
+        post = await db.blog_posts.find_one({"slug": slug, "status": "published"})
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return doc_to_out(post, full=True)
+
+    def from_snapshot():
+        posts = snapshot.blog_post(slug)
+        if posts == []:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return posts[0] if posts else None
+
+    return await snapshot.read_with_fallback(response, from_db(), from_snapshot)
 
 
 # ─── Admin endpoints ──────────────────────────────────────
 
-@router.get("/admin/posts", response_model=list[BlogPostOut])
+@router.get("/admin/posts", response_model=list[BlogPostSummaryOut])
 async def get_all_posts(
     status: Optional[str] = None,
     search: Optional[str] = None,
@@ -106,7 +149,7 @@ async def get_all_posts(
             {"title.ar": {"$regex": search, "$options": "i"}},
         ]
 
-    cursor = db.blog_posts.find(query).sort("created_at", -1)
+    cursor = db.blog_posts.find(query, LIST_PROJECTION).sort("created_at", -1)
     posts = await cursor.to_list(length=200)
     return [doc_to_out(p) for p in posts]
 
@@ -117,11 +160,15 @@ async def get_post_by_id(post_id: str, admin: dict = Depends(get_admin_user)):
     post = await db.blog_posts.find_one({"_id": ObjectId(post_id)})
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return doc_to_out(post)
+    return doc_to_out(post, full=True)
 
 
 @router.post("/admin/posts", response_model=BlogPostOut, status_code=201)
-async def create_post(data: BlogPostCreate, admin: dict = Depends(get_admin_user)):
+async def create_post(
+    data: BlogPostCreate,
+    background_tasks: BackgroundTasks,
+    admin: dict = Depends(get_admin_user),
+):
     db = get_db()
 
     slug = generate_slug(data.title.en or data.title.ar or "untitled")
@@ -137,17 +184,30 @@ async def create_post(data: BlogPostCreate, admin: dict = Depends(get_admin_user
         "slug": slug,
         "author_id": admin["id"],
         "author_name": admin["name"],
+        "rendered": {},
+        "rendered_version": None,  # set by the render_post job
         "created_at": now,
         "updated_at": now,
     }
 
     result = await db.blog_posts.insert_one(doc)
     doc["_id"] = result.inserted_id
-    return doc_to_out(doc)
+    await enqueue_render(doc)
+    await feeds.patch("blog", str(doc["_id"]))
+    drain_after_response(background_tasks)
+    invalidate("home")
+    suggestion_index.update_post(doc)
+    snapshot.schedule_refresh()
+    return doc_to_out(doc, full=True)
 
 
 @router.put("/admin/posts/{post_id}", response_model=BlogPostOut)
-async def update_post(post_id: str, data: BlogPostUpdate, admin: dict = Depends(get_admin_user)):
+async def update_post(
+    post_id: str,
+    data: BlogPostUpdate,
+    background_tasks: BackgroundTasks,
+    admin: dict = Depends(get_admin_user),
+):
     db = get_db()
 
     existing = await db.blog_posts.find_one({"_id": ObjectId(post_id)})
@@ -155,6 +215,7 @@ async def update_post(post_id: str, data: BlogPostUpdate, admin: dict = Depends(
         raise HTTPException(status_code=404, detail="Post not found")
 
     update_data = data.model_dump()
+    update_data["rendered_version"] = None  # set by the render_post job
     update_data["updated_at"] = datetime.now(timezone.utc)
 
     # Update slug if English title changed
@@ -166,9 +227,15 @@ async def update_post(post_id: str, data: BlogPostUpdate, admin: dict = Depends(
         update_data["slug"] = new_slug
 
     await db.blog_posts.update_one({"_id": ObjectId(post_id)}, {"$set": update_data})
+    invalidate("home")
 
     updated = await db.blog_posts.find_one({"_id": ObjectId(post_id)})
-    return doc_to_out(updated)
+    await enqueue_render(updated)
+    await feeds.patch("blog", post_id)
+    drain_after_response(background_tasks)
+    suggestion_index.update_post(updated)
+    snapshot.schedule_refresh()
+    return doc_to_out(updated, full=True)
 
 
 @router.delete("/admin/posts/{post_id}", status_code=204)
@@ -177,6 +244,10 @@ async def delete_post(post_id: str, admin: dict = Depends(get_admin_user)):
     result = await db.blog_posts.delete_one({"_id": ObjectId(post_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Post not found")
+    invalidate("home")
+    suggestion_index.remove("blog_posts", post_id)
+    await feeds.patch("blog", post_id)
+    snapshot.schedule_refresh()
 
 
 # ─── Image Upload ──────────────────────────────────────────
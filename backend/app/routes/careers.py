@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from datetime import datetime, timezone
 from typing import Optional
 from bson import ObjectId
@@ -10,6 +10,10 @@ from app.models import (
 )
 from app.auth import get_admin_user
 from app.database import get_db
+from app.cache import invalidate
+from app.search import suggestion_index
+from app import snapshot
+from app import feeds
 
 router = APIRouter(prefix="/api/careers", tags=["Careers"])
 
@@ -36,6 +40,7 @@ def doc_to_out(doc: dict) -> CareerPostOut:
 
 @router.get("/posts", response_model=list[CareerPostOut])
 async def get_active_careers(
+    response: Response,
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
@@ -52,9 +57,17 @@ async def get_active_careers(
         ]
 
     skip = (page - 1) * limit
-    cursor = db.career_posts.find(query).sort("created_at", -1).skip(skip).limit(limit)
-    posts = await cursor.to_list(length=limit)
-    return [doc_to_out(p) for p in posts]
+
+    async def from_db():
+        cursor = db.career_posts.find(query).sort("created_at", -1).skip(skip).limit(limit)
+        posts = await cursor.to_list(length=limit)
+        return [doc_to_out(p) for p in posts]
+
+    return await snapshot.read_with_fallback(
+        response,
+        from_db(),
+        lambda: snapshot.career_posts(search=search, skip=skip, limit=limit),
+    )
 
 
 # ─── Admin endpoints ──────────────────────────────────────
@@ -97,6 +110,10 @@ async def create_career(data: CareerPostCreate, admin: dict = Depends(get_admin_
     }
     result = await db.career_posts.insert_one(doc)
     doc["_id"] = result.inserted_id
+    invalidate("home")
+    suggestion_index.update_career(doc)
+    await feeds.patch("careers", str(doc["_id"]))
+    snapshot.schedule_refresh()
     return doc_to_out(doc)
 
 
@@ -111,7 +128,11 @@ async def update_career(post_id: str, data: CareerPostUpdate, admin: dict = Depe
     update_data["updated_at"] = datetime.now(timezone.utc)
 
     await db.career_posts.update_one({"_id": ObjectId(post_id)}, {"$set": update_data})
+    invalidate("home")
     updated = await db.career_posts.find_one({"_id": ObjectId(post_id)})
+    suggestion_index.update_career(updated)
+    await feeds.patch("careers", post_id)
+    snapshot.schedule_refresh()
     return doc_to_out(updated)
 
 
@@ -121,3 +142,7 @@ async def delete_career(post_id: str, admin: dict = Depends(get_admin_user)):
     result = await db.career_posts.delete_one({"_id": ObjectId(post_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Career not found")
+    invalidate("home")
+    suggestion_index.remove("career_posts", post_id)
+    await feeds.patch("careers", post_id)
+    snapshot.schedule_refresh()
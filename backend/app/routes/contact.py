@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timezone
 from typing import Optional
 from bson import ObjectId
+import csv
+import io
 
 from app.models import ContactInquiryCreate, ContactInquiryOut
 from app.auth import get_admin_user
 from app.database import get_db
+from app.archive import delete_archived, find_archived, get_archived, iter_archived
 
 router = APIRouter(prefix="/api/contact", tags=["Contact"])
 
 
-def doc_to_out(doc: dict) -> ContactInquiryOut:
+EXPORT_FIELDS = [
+    "id", "created_at", "full_name", "phone_number", "email", "city",
+    "service_type", "project_type", "budget", "message", "read", "archived",
+]
+
+
+def doc_to_out(doc: dict, archived: bool = False) -> ContactInquiryOut:
     return ContactInquiryOut(
         id=str(doc["_id"]),
         full_name=doc.get("full_name", ""),
@@ -22,6 +32,7 @@ def doc_to_out(doc: dict) -> ContactInquiryOut:
         budget=doc.get("budget", ""),
         message=doc.get("message", ""),
         read=doc.get("read", False),
+        archived=archived,
         created_at=doc.get("created_at", datetime.now(timezone.utc)),
     )
 
@@ -47,6 +58,7 @@ async def create_inquiry(data: ContactInquiryCreate):
 @router.get("/admin/inquiries", response_model=list[ContactInquiryOut])
 async def get_all_inquiries(
     read: Optional[bool] = None,
+    include_archived: bool = False,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
     admin: dict = Depends(get_admin_user),
@@ -57,9 +69,49 @@ async def get_all_inquiries(
         query["read"] = read
 
     skip = (page - 1) * limit
-    cursor = db.contact_inquiries.find(query).sort("created_at", -1).skip(skip).limit(limit)
-    docs = await cursor.to_list(length=limit)
-    return [doc_to_out(d) for d in docs]
+    # Archived inquiries are all read, so unread listings never need the archive
+    if not include_archived or read is False:
+        cursor = db.contact_inquiries.find(query).sort("created_at", -1).skip(skip).limit(limit)
+        docs = await cursor.to_list(length=limit)
+        return [doc_to_out(d) for d in docs]
+
+    # Merge the newest (skip + limit) of each tier, then take the page
+    need = skip + limit
+    cursor = db.contact_inquiries.find(query).sort("created_at", -1).limit(need)
+    hot = [(d, False) for d in await cursor.to_list(length=need)]
+    archived = [(d, True) for d in await find_archived(need)]
+    merged = sorted(hot + archived, key=lambda item: item[0]["created_at"], reverse=True)
+    return [doc_to_out(d, archived=a) for d, a in merged[skip:skip + limit]]
+
+
+# ─── Admin: Export inquiries as CSV ───────────────────────
+
+@router.get("/admin/inquiries/export")
+async def export_inquiries(
+    include_archived: bool = False,
+    admin: dict = Depends(get_admin_user),
+):
+    db = get_db()
+
+    def row(doc: dict, archived: bool) -> str:
+        data = doc_to_out(doc, archived=archived).model_dump()
+        buf = io.StringIO()
+        csv.writer(buf).writerow([data[f] for f in EXPORT_FIELDS])
+        return buf.getvalue()
+
+    async def generate():
+        yield ",".join(EXPORT_FIELDS) + "\r\n"
+        async for doc in db.contact_inquiries.find({}).sort("created_at", -1):
+            yield row(doc, False)
+        if include_archived:
+            async for doc in iter_archived():
+                yield row(doc, True)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="inquiries.csv"'},
+    )
 
 
 # ─── Admin: Mark inquiry as read ──────────────────────────
@@ -72,10 +124,13 @@ async def mark_inquiry_read(inquiry_id: str, admin: dict = Depends(get_admin_use
         {"$set": {"read": True}},
     )
     doc = await db.contact_inquiries.find_one({"_id": ObjectId(inquiry_id)})
+    if doc:
+        return doc_to_out(doc)
+    # Only read inquiries are archived, so there is nothing to update
+    doc = await get_archived(ObjectId(inquiry_id))
     if not doc:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Inquiry not found")
-    return doc_to_out(doc)
+    return doc_to_out(doc, archived=True)
 
 
 # ─── Admin: Delete inquiry ────────────────────────────────
@@ -83,7 +138,6 @@ async def mark_inquiry_read(inquiry_id: str, admin: dict = Depends(get_admin_use
 @router.delete("/admin/inquiries/{inquiry_id}", status_code=204)
 async def delete_inquiry(inquiry_id: str, admin: dict = Depends(get_admin_user)):
     db = get_db()
-    from fastapi import HTTPException
     result = await db.contact_inquiries.delete_one({"_id": ObjectId(inquiry_id)})
-    if result.deleted_count == 0:
+    if result.deleted_count == 0 and not await delete_archived(ObjectId(inquiry_id)):
         raise HTTPException(status_code=404, detail="Inquiry not found")
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from email.utils import format_datetime, parsedate_to_datetime
+
+from app import feeds
+from app.models import LOCALES
+
+router = APIRouter(tags=["Feeds"])
+
+CACHE_CONTROL = "public, max-age=300"
+
+
+async def xml_response(request: Request, name: str, render, media_type: str) -> Response:
+    """Serve a cached feed document, answering conditional GETs with 304."""
+    body, artifact = await feeds.get_document(name, render)
+    etag = f'"{artifact["version"]}"'
+    last_modified = feeds.as_utc(artifact["updated_at"]).replace(microsecond=0)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+        except (TypeError, ValueError):
+            since = None
+        if since is not None and last_modified <= since:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def check_params(lang: str, section: str):
+    if lang not in LOCALES or section not in feeds.SECTIONS:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+
+@router.get("/sitemap.xml")
+async def sitemap(request: Request):
+    return await xml_response(request, "sitemap", feeds.render_sitemap, "application/xml")
+
+
+@router.get("/feeds/{lang}/{section}.rss")
+async def rss_feed(lang: str, section: str, request: Request):
+    check_params(lang, section)
+    return await xml_response(
+        request,
+        f"rss:{section}:{lang}",
+        lambda artifact: feeds.render_rss(section, artifact, lang),
+        "application/rss+xml",
+    )
+
+
+@router.get("/feeds/{lang}/{section}.atom")
+async def atom_feed(lang: str, section: str, request: Request):
+    check_params(lang, section)
+    return await xml_response(
+        request,
+        f"atom:{section}:{lang}",
+        lambda artifact: feeds.render_atom(section, artifact, lang),
+        "application/atom+xml",
+    )
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, Query, Response
+from datetime import datetime, timezone
+import asyncio
+
+from app.models import HomeOut, HomeBlogPost, HomeCareer, localized
+from app.database import get_db
+from app.cache import get_cache
+from app import snapshot
+
+router = APIRouter(prefix="/api/home", tags=["Home"])
+
+FEATURED_LIMIT = 3
+LATEST_LIMIT = 6
+CAREERS_LIMIT = 6
+
+home_cache = get_cache("home", ttl=300)
+
+
+def blog_projection(lang: str) -> dict:
+    return {
+        "slug": 1,
+        f"title.{lang}": 1,
+        "title.en": 1,
+        f"excerpt.{lang}": 1,
+        "excerpt.en": 1,
+        "cover_image": 1,
+        "category": 1,
+        "featured": 1,
+        f"rendered.{lang}.reading_time": 1,
+        "rendered.en.reading_time": 1,
+        "created_at": 1,
+    }
+
+
+def blog_doc_to_home(doc: dict, lang: str) -> HomeBlogPost:
+    rendered = doc.get("rendered", {})
+    reading_time = (rendered.get(lang) or rendered.get("en") or {}).get("reading_time", 0)
+    return HomeBlogPost(
+        id=str(doc["_id"]),
+        slug=doc.get("slug", ""),
+        title=localized(doc.get("title"), lang),
+        excerpt=localized(doc.get("excerpt"), lang),
+        cover_image=doc.get("cover_image", ""),
+        category=doc.get("category", ""),
+        featured=doc.get("featured", False),
+        reading_time=reading_time,
+        created_at=doc.get("created_at", datetime.now(timezone.utc)),
+    )
+
+
+def career_doc_to_home(doc: dict, lang: str) -> HomeCareer:
+    return HomeCareer(
+        id=str(doc["_id"]),
+        title=localized(doc.get("title"), lang),
+        department=localized(doc.get("department"), lang),
+        location=doc.get("location", ""),
+        job_type=doc.get("job_type", "full-time"),
+        created_at=doc.get("created_at", datetime.now(timezone.utc)),
+    )
+
+
+@router.get("", response_model=HomeOut)
+async def get_home(response: Response, lang: str = Query("en", pattern="^(en|ar|fr|de)$")):
+    """Everything the landing page needs in one round trip.
+
+    Cached per language; the blog and careers write handlers invalidate it.
+    """
+    cached = home_cache.get(lang)
+    if cached is not None:
+        return cached
+    generation = home_cache.generation
+
+    db = get_db()
+    projection = blog_projection(lang)
+
+    # Served by the partial "featured_published" index.
+    featured_cursor = (
+        db.blog_posts.find({"featured": True, "status": "published"}, projection)
+        .sort("created_at", -1)
+        .limit(FEATURED_LIMIT)
+    )
+    latest_cursor = (
+        db.blog_posts.find({"status": "published"}, projection)
+        .sort("created_at", -1)
+        .limit(LATEST_LIMIT)
+    )
+    careers_cursor = (
+        db.career_posts.find(
+            {"status": "active"},
+            {
+                f"title.{lang}": 1,
+                "title.en": 1,
+                f"department.{lang}": 1,
+                "department.en": 1,
+                "location": 1,
+                "job_type": 1,
+                "created_at": 1,
+            },
+        )
+        .sort("created_at", -1)
+        .limit(CAREERS_LIMIT)
+    )
+
+    async def from_db():
+        featured, latest, careers = await asyncio.gather(
+            featured_cursor.to_list(length=FEATURED_LIMIT),
+            latest_cursor.to_list(length=LATEST_LIMIT),
+            careers_cursor.to_list(length=CAREERS_LIMIT),
+        )
+        return HomeOut(
+            featured_posts=[blog_doc_to_home(d, lang) for d in featured],
+            latest_posts=[blog_doc_to_home(d, lang) for d in latest],
+            careers=[career_doc_to_home(d, lang) for d in careers],
+        )
+
+    def from_snapshot():
+        featured = snapshot.blog_posts(featured=True, limit=FEATURED_LIMIT)
+        if featured is None:
+            return None
+        latest = snapshot.blog_posts(limit=LATEST_LIMIT)
+        careers = snapshot.career_posts(limit=CAREERS_LIMIT)
+        # Snapshot rows are API documents; give them the "_id" the mappers expect
+        return HomeOut(
+            featured_posts=[blog_doc_to_home({**d, "_id": d["id"]}, lang) for d in featured],
+            latest_posts=[blog_doc_to_home({**d, "_id": d["id"]}, lang) for d in latest],
+            careers=[career_doc_to_home({**d, "_id": d["id"]}, lang) for d in careers],
+        )
+
+    result = await snapshot.read_with_fallback(response, from_db(), from_snapshot)
+    if snapshot.STALE_HEADER not in response.headers:
+        home_cache.set(lang, result, generation)
+    return result
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app.auth import get_admin_user
+from app.jobs import metrics
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+@router.get("/admin/metrics")
+async def get_job_metrics(admin: dict = Depends(get_admin_user)):
+    return await metrics()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Query
+
+from app.models import Suggestion
+from app.search import suggestion_index
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+
+@router.get("/suggest", response_model=list[Suggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    lang: str = Query("en", pattern="^(en|ar|fr|de)$"),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """Typeahead for blog titles, tags, career titles, departments and locations.
+
+    Empty until the index has been built; the first request starts the build.
+    """
+    if not suggestion_index.ready:
+        suggestion_index.rebuild()
+        return []
+    return suggestion_index.suggest(q, lang, limit)
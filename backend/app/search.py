@@ -0,0 +1,221 @@
+"""In-memory prefix index for search-as-you-type suggestions.
+
+One sorted array of ``(key, kind, text, ref)`` tuples per locale, where ``key``
+is the normalized text starting at each word of a title, tag, department or
+location. A lookup is a bisect to the first key with the typed prefix followed
+by a short forward scan, so it never touches MongoDB.
+
+Built at startup from published posts and active careers, patched by the admin
+write handlers, and refreshed from change events raised by other workers.
+Patches that land while a rebuild is reading MongoDB are carried over into the
+rebuilt arrays instead of being lost in the swap.
+"""
+import asyncio
+import logging
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Optional
+
+from app.database import get_db
+from app.invalidation import add_listener
+from app.models import LOCALES, localized
+
+logger = logging.getLogger(__name__)
+
+MAX_SCAN = 200
+
+Entry = tuple[str, str, str, str]  # (key, kind, text, ref)
+
+
+def normalize(text: str) -> str:
+    """Casefold and drop diacritics (including Arabic harakat)."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip()
+
+
+def _keys(text: str) -> set[str]:
+    """The normalized text starting at each of its words."""
+    words = normalize(text).split()
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+def _make_entries(terms_for) -> dict[str, list[Entry]]:
+    """Entries per locale from ``terms_for(lang) -> [(kind, text, ref)]``."""
+    return {
+        lang: [
+            (key, kind, text, ref)
+            for kind, text, ref in terms_for(lang) if text
+            for key in _keys(text)
+        ]
+        for lang in LOCALES
+    }
+
+
+class SuggestionIndex:
+    def __init__(self):
+        self._entries: dict[str, list[Entry]] = {lang: [] for lang in LOCALES}
+        self._sources: dict[tuple[str, str], dict[str, list[Entry]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._building: Optional[asyncio.Task] = None
+        # Sources patched during the current build, or None when not building
+        self._touched: Optional[set[tuple[str, str]]] = None
+        self.ready = False
+
+    # ─── Building ─────────────────────────────────────────
+
+    @staticmethod
+    def _post_terms(doc: dict, lang: str) -> list[tuple[str, str, str]]:
+        terms = [("blog", localized(doc.get("title"), lang), doc.get("slug", ""))]
+        terms += [("tag", tag, tag) for tag in doc.get("tags", [])]
+        return terms
+
+    @staticmethod
+    def _career_terms(doc: dict, lang: str) -> list[tuple[str, str, str]]:
+        ref = str(doc["_id"])
+        return [
+            ("career", localized(doc.get("title"), lang), ref),
+            ("department", localized(doc.get("department"), lang), ""),
+            ("location", doc.get("location", ""), ""),
+        ]
+
+    def _add(self, source: tuple[str, str], terms_for):
+        self.remove(*source)
+        if self._touched is not None:
+            self._touched.add(source)
+        added = _make_entries(terms_for)
+        for lang, entries in added.items():
+            for entry in entries:
+                insort(self._entries[lang], entry)
+        self._sources[source] = added
+
+    def remove(self, collection: str, doc_id: str):
+        if self._touched is not None:
+            self._touched.add((collection, doc_id))
+        added = self._sources.pop((collection, doc_id), None)
+        if not added:
+            return
+        for lang, entries in added.items():
+            array = self._entries[lang]
+            for entry in entries:
+                i = bisect_left(array, entry)
+                if i < len(array) and array[i] == entry:
+                    del array[i]
+
+    def update_post(self, doc: dict):
+        if doc.get("status") != "published":
+            return self.remove("blog_posts", str(doc["_id"]))
+        self._add(("blog_posts", str(doc["_id"])), lambda lang: self._post_terms(doc, lang))
+
+    def update_career(self, doc: dict):
+        if doc.get("status") != "active":
+            return self.remove("career_posts", str(doc["_id"]))
+        self._add(("career_posts", str(doc["_id"])), lambda lang: self._career_terms(doc, lang))
+
+    def rebuild(self) -> asyncio.Task:
+        """Start a full rebuild unless one is already running; returns its task."""
+        if self._building is None or self._building.done():
+            self._building = asyncio.create_task(self._build())
+            self._building.add_done_callback(self._log_failure)
+        return self._building
+
+    async def build(self):
+        await self.rebuild()
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Suggestion index build failed", exc_info=task.exception())
+
+    async def _build(self):
+        self._touched = set()
+        try:
+            entries, sources = await self._collect()
+        finally:
+            touched, self._touched = self._touched, None
+
+        for lang in LOCALES:
+            entries[lang].sort()
+        live = self._sources
+        self._entries, self._sources = entries, sources
+        # The live index has the newer version of anything patched meanwhile
+        for source in touched:
+            self.remove(*source)
+            for lang, found in live.get(source, {}).items():
+                for entry in found:
+                    insort(self._entries[lang], entry)
+            if source in live:
+                self._sources[source] = live[source]
+        self.ready = True
+
+    async def _collect(self):
+        db = get_db()
+        entries: dict[str, list[Entry]] = {lang: [] for lang in LOCALES}
+        sources: dict[tuple[str, str], dict[str, list[Entry]]] = {}
+
+        def collect(source, terms_for):
+            sources[source] = _make_entries(terms_for)
+            for lang, found in sources[source].items():
+                entries[lang].extend(found)
+
+        posts = db.blog_posts.find({"status": "published"}, {"title": 1, "tags": 1, "slug": 1})
+        async for doc in posts:
+            collect(("blog_posts", str(doc["_id"])), lambda lang: self._post_terms(doc, lang))
+        careers = db.career_posts.find(
+            {"status": "active"}, {"title": 1, "department": 1, "location": 1}
+        )
+        async for doc in careers:
+            collect(("career_posts", str(doc["_id"])), lambda lang: self._career_terms(doc, lang))
+        return entries, sources
+
+    # ─── Lookup ───────────────────────────────────────────
+
+    def suggest(self, q: str, lang: str = "en", limit: int = 8) -> list[dict]:
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        array = self._entries.get(lang) or self._entries["en"]
+        results = []
+        seen = set()
+        i = bisect_left(array, (prefix,))
+        end = min(len(array), i + MAX_SCAN)
+        while i < end and array[i][0].startswith(prefix):
+            _, kind, text, ref = array[i]
+            if (kind, text) not in seen:
+                seen.add((kind, text))
+                results.append({"text": text, "kind": kind, "ref": ref})
+                if len(results) >= limit:
+                    break
+            i += 1
+        return results
+
+    # ─── Change events from other workers ─────────────────
+
+    async def refresh(self, collection: str, doc_id):
+        db = get_db()
+        doc = await db[collection].find_one({"_id": doc_id})
+        if doc is None:
+            self.remove(collection, str(doc_id))
+        elif collection == "blog_posts":
+            self.update_post(doc)
+        else:
+            self.update_career(doc)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def on_change(self, collection: str, change: dict):
+        key = change.get("documentKey", {}).get("_id")
+        if key is None:
+            self.rebuild()
+        elif change.get("operationType") == "delete":
+            self.remove(collection, str(key))
+        else:
+            self._spawn(self.refresh(collection, key))
+
+
+suggestion_index = SuggestionIndex()
+
+add_listener("blog_posts", lambda change: suggestion_index.on_change("blog_posts", change))
+add_listener("career_posts", lambda change: suggestion_index.on_change("career_posts", change))
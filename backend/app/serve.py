@@ -0,0 +1,25 @@
+"""Production entry point: ``python -m app.serve``.
+
+Runs ``WEB_CONCURRENCY`` uvicorn worker processes. Each worker keeps its own
+in-memory caches and tails the MongoDB change stream (see app/invalidation.py)
+so edits made through any worker invalidate all of them.
+
+X-Forwarded-* headers are honoured only from the addresses in uvicorn's
+``FORWARDED_ALLOW_IPS`` environment variable (default 127.0.0.1); set it to the
+load balancer's addresses in production.
+"""
+import uvicorn
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WEB_CONCURRENCY,
+        proxy_headers=True,
+    )
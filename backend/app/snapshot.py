@@ -0,0 +1,285 @@
+"""Local read-only snapshot of public content for MongoDB incidents.
+
+Published blog posts and active careers are copied into a SQLite file in the
+system temp directory (not UPLOAD_DIR, which is served publicly). Public
+routes read from MongoDB as usual, but if a call errors or takes longer than
+READ_LATENCY_BUDGET they answer from the snapshot instead and mark the response
+with ``X-Content-Stale: true``.
+
+The snapshot is rebuilt in the background at startup and shortly after any
+admin write (on this worker or, via change streams, on another). Each rebuild
+writes a fresh file and atomically swaps it in, so readers never see a partial
+snapshot and a failed rebuild leaves the previous one in place.
+
+Workers on one host share the file, so a rebuild takes a per-host lease (see
+app/locks.py) and records when it started reading. A worker whose request is
+already covered by a newer snapshot, written by whichever worker held the
+lease, skips its own scan.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, Response
+from pymongo.errors import PyMongoError
+
+from app import locks
+from app.config import get_settings
+from app.database import get_db
+from app.invalidation import add_listener
+from app.rendering import public_rendered
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STALE_HEADER = "X-Content-Stale"
+REFRESH_DELAY = 1.0  # seconds; coalesces bursts of admin writes
+LOCK_ID = f"snapshot:{socket.gethostname()}"
+LOCK_LEASE = timedelta(minutes=2)
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value REAL);
+CREATE TABLE blog_posts (
+    id TEXT PRIMARY KEY,
+    slug TEXT UNIQUE,
+    category TEXT,
+    featured INTEGER,
+    search_text TEXT,
+    created_at TEXT,
+    doc TEXT
+);
+CREATE INDEX blog_posts_created ON blog_posts (created_at DESC);
+CREATE TABLE career_posts (
+    id TEXT PRIMARY KEY,
+    search_text TEXT,
+    created_at TEXT,
+    doc TEXT
+);
+CREATE INDEX career_posts_created ON career_posts (created_at DESC);
+"""
+
+
+def snapshot_path() -> str:
+    return settings.SNAPSHOT_PATH or os.path.join(tempfile.gettempdir(), "bedir_snapshot.sqlite3")
+
+
+def _search_text(*values) -> str:
+    parts = []
+    for value in values:
+        if isinstance(value, dict):
+            parts.extend(v for v in value.values() if v)
+        elif isinstance(value, list):
+            parts.extend(value)
+        elif value:
+            parts.append(value)
+    return " ".join(parts).lower()
+
+
+# ─── Writing ───────────────────────────────────────────────
+
+def _write(path: str, posts: list, careers: list, started_at: float):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('started_at', ?)", (started_at,))
+        conn.executemany(
+            "INSERT INTO blog_posts VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    p.id, p.slug, p.category, int(p.featured),
+                    _search_text(p.title.model_dump(), p.tags),
+                    p.created_at.isoformat(), p.model_dump_json(),
+                )
+                for p in posts
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO career_posts VALUES (?, ?, ?, ?)",
+            [
+                (
+                    c.id,
+                    _search_text(c.title.model_dump(), c.department.model_dump(), c.location),
+                    c.created_at.isoformat(), c.model_dump_json(),
+                )
+                for c in careers
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+async def refresh():
+    """Rebuild the snapshot from MongoDB."""
+    started_at = time.time()
+    from app.routes.blog import doc_to_out as blog_doc_to_out
+    from app.routes.careers import doc_to_out as career_doc_to_out
+
+    db = get_db()
+    posts = [
+        blog_doc_to_out(d, full=True)
+        async for d in db.blog_posts.find({"status": "published"})
+    ]
+    careers = [
+        career_doc_to_out(d)
+        async for d in db.career_posts.find({"status": "active"})
+    ]
+    os.makedirs(os.path.dirname(snapshot_path()) or ".", exist_ok=True)
+    await asyncio.to_thread(_write, snapshot_path(), posts, careers, started_at)
+
+
+def started_at() -> float:
+    """When the current snapshot started reading MongoDB (0 if there is none)."""
+    path = snapshot_path()
+    if not os.path.exists(path):
+        return 0.0
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'started_at'").fetchone()
+        return row[0] if row else 0.0
+    except sqlite3.OperationalError:
+        return 0.0  # written before the meta table existed
+    finally:
+        conn.close()
+
+
+async def _refresh_if_needed(requested_at: float) -> bool:
+    """Rebuild unless a snapshot that started after ``requested_at`` exists.
+
+    Returns False if another worker on this host holds the lease; its result
+    may or may not cover this request, so the caller checks again later.
+    """
+    if await asyncio.to_thread(started_at) >= requested_at:
+        return True
+    db = get_db()
+    owner = await locks.acquire(db, LOCK_ID, LOCK_LEASE)
+    if owner is None:
+        return False
+    try:
+        if await asyncio.to_thread(started_at) < requested_at:
+            await refresh()
+    finally:
+        await locks.release(db, LOCK_ID, owner)
+    return True
+
+
+_pending: Optional[asyncio.Task] = None
+_requested_at: Optional[float] = None  # latest request not yet covered
+
+
+async def _refresh_later():
+    global _requested_at
+    while True:
+        await asyncio.sleep(REFRESH_DELAY)
+        requested_at = _requested_at
+        try:
+            if not await _refresh_if_needed(requested_at):
+                continue  # another worker is writing; check its result next time
+        except Exception:
+            logger.exception("Snapshot refresh failed; keeping the previous one")
+        if _requested_at == requested_at:
+            _requested_at = None
+            return
+
+
+def schedule_refresh():
+    """Rebuild the snapshot soon, coalescing repeated calls.
+
+    A call made while a refresh is already reading MongoDB queues one more.
+    """
+    global _pending, _requested_at
+    if not settings.SNAPSHOT_ENABLED:
+        return
+    _requested_at = time.time()
+    if _pending is None or _pending.done():
+        _pending = asyncio.create_task(_refresh_later())
+
+
+add_listener("blog_posts", lambda change: schedule_refresh())
+add_listener("career_posts", lambda change: schedule_refresh())
+
+
+# ─── Reading ───────────────────────────────────────────────
+
+def _query(sql: str, params: tuple = ()) -> Optional[list]:
+    path = snapshot_path()
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return [json.loads(row[0]) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def blog_posts(
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    featured: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> Optional[list]:
+    sql, params = "SELECT doc FROM blog_posts WHERE 1=1", []
+    if category:
+        sql += " AND category = ?"
+        params.append(category)
+    if search:
+        sql += " AND search_text LIKE ?"
+        params.append(f"%{search.lower()}%")
+    if featured is not None:
+        sql += " AND featured = ?"
+        params.append(int(featured))
+    sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    rows = _query(sql, (*params, limit, skip))
+    if rows is None:
+        return None
+    # Stored rows are full posts (for blog_post); lists get the summary only
+    return [{**r, "rendered": public_rendered(r.get("rendered"), summary=True)} for r in rows]
+
+
+def blog_post(slug: str) -> Optional[list]:
+    return _query("SELECT doc FROM blog_posts WHERE slug = ?", (slug,))
+
+
+def career_posts(search: Optional[str] = None, skip: int = 0, limit: int = 20) -> Optional[list]:
+    sql, params = "SELECT doc FROM career_posts", []
+    if search:
+        sql += " WHERE search_text LIKE ?"
+        params.append(f"%{search.lower()}%")
+    sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    return _query(sql, (*params, limit, skip))
+
+
+async def read_with_fallback(
+    response: Response,
+    primary: Awaitable[T],
+    fallback: Callable[[], Optional[T]],
+) -> T:
+    """Await ``primary``; if MongoDB is slow or down, serve ``fallback()`` instead.
+
+    ``fallback`` runs in a thread and returns None when there is no snapshot, in
+    which case the request fails with 503.
+    """
+    try:
+        return await asyncio.wait_for(primary, timeout=settings.READ_LATENCY_BUDGET)
+    except (asyncio.TimeoutError, PyMongoError) as e:
+        if not settings.SNAPSHOT_ENABLED:
+            raise
+        result = await asyncio.to_thread(fallback)
+        if result is None:
+            raise HTTPException(status_code=503, detail="Database unavailable") from e
+        response.headers[STALE_HEADER] = "true"
+        return result
@@ -0,0 +1,38 @@
+"""Job handlers for work derived from admin writes (see app/jobs.py)."""
+from bson import ObjectId
+
+from app.cache import invalidate
+from app.database import get_db
+from app.jobs import enqueue, job
+from app.rendering import RENDER_VERSION, render_content
+from app import snapshot
+
+
+async def enqueue_render(post: dict):
+    """Queue rendering for this exact revision of a post."""
+    revision = post["updated_at"].isoformat()
+    await enqueue(
+        "render_post",
+        {"post_id": str(post["_id"]), "updated_at": post["updated_at"]},
+        idempotency_key=f"render_post:{post['_id']}:{revision}",
+    )
+
+
+@job("render_post")
+async def render_post(payload: dict):
+    db = get_db()
+    post = await db.blog_posts.find_one(
+        {"_id": ObjectId(payload["post_id"])}, {"content": 1, "rendered": 1, "updated_at": 1}
+    )
+    if post is None:
+        return  # deleted since
+    rendered = render_content(post.get("content"), post.get("rendered"))
+    # Only write if the post has not been edited since; a newer job covers that.
+    result = await db.blog_posts.update_one(
+        {"_id": post["_id"], "updated_at": payload["updated_at"]},
+        {"$set": {"rendered": rendered, "rendered_version": RENDER_VERSION}},
+    )
+    if result.modified_count:
+        invalidate("home")
+        snapshot.schedule_refresh()
+
@@ -0,0 +1,29 @@
+"""Standalone job worker: ``python -m app.worker [--drain]``.
+
+For deployments where the web process does not run workers (e.g. serverless).
+With ``--drain`` it exits once no jobs are ready, so it can run from a cron.
+"""
+import asyncio
+import sys
+
+from app.config import get_settings
+from app.database import connect_db, close_db
+from app.jobs import start_workers, work
+from app import tasks  # noqa: F401  (registers job handlers)
+
+settings = get_settings()
+
+
+async def main(drain: bool):
+    await connect_db()
+    try:
+        if drain:
+            await work(drain=True)
+        else:
+            await asyncio.gather(*start_workers(max(1, settings.JOB_WORKERS)))
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(drain="--drain" in sys.argv))
@@ -0,0 +1,19 @@
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import app.database as database
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """An in-memory database behind app.database.get_db()."""
+    mock = AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(database, "client", object())
+    monkeypatch.setattr(database, "db", mock)
+    monkeypatch.setattr(database, "_connected", True)
+    return mock
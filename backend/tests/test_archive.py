@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import archive
+
+
+def days_ago(n):
+    return datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None) - timedelta(days=n)
+
+
+async def add_inquiries(db, count, age_days=400, read=True):
+    docs = [
+        {"full_name": f"n{i}", "email": f"n{i}@example.com", "read": read,
+         "created_at": days_ago(age_days) + timedelta(hours=i)}
+        for i in range(count)
+    ]
+    result = await db.contact_inquiries.insert_many(docs)
+    return result.inserted_ids
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(archive.settings, "INQUIRY_ARCHIVE_BATCH", 3)
+    monkeypatch.setattr(archive.settings, "INQUIRY_RETENTION_DAYS", 180)
+
+
+@pytest.mark.anyio
+async def test_archives_only_old_read_inquiries(db, small_batches):
+    old = await add_inquiries(db, 5)
+    await add_inquiries(db, 2, age_days=10)
+    await add_inquiries(db, 2, read=False)
+
+    assert await archive.run_archiver() == 5
+    assert await db.contact_inquiries.count_documents({}) == 4
+    batches = await db.contact_inquiries_archive.find().sort("max_created_at", 1).to_list(10)
+    assert [b["count"] for b in batches] == [3, 2]
+    assert [i for b in batches for i in b["ids"]] == old
+    assert [d["_id"] for d in archive.unpack(batches[0])] == old[:3]
+    assert await db.locks.count_documents({}) == 0
+
+
+@pytest.mark.anyio
+async def test_interrupted_run_only_deletes_already_archived(db, small_batches):
+    ids = await add_inquiries(db, 3)
+    # A previous run wrote the batch, then died before deleting from the hot collection
+    docs = await db.contact_inquiries.find().sort("created_at", 1).to_list(10)
+    await db.contact_inquiries_archive.insert_one({
+        "ids": ids[:2], "count": 2, "min_created_at": docs[0]["created_at"],
+        "max_created_at": docs[1]["created_at"], "data": archive.pack(docs[:2]),
+    })
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=180)
+    assert await archive.archive_batch(db, cutoff) == 1
+    assert await db.contact_inquiries.count_documents({}) == 0
+    assert await archive.archive_batch(db, cutoff) == 0
+    archived_ids = await db.contact_inquiries_archive.distinct("ids")
+    assert sorted(archived_ids) == sorted(ids)  # nothing archived twice
+
+
+@pytest.mark.anyio
+async def test_find_archived_merges_batches_newest_first(db, small_batches):
+    await add_inquiries(db, 7)
+    await archive.run_archiver()
+    names = [d["full_name"] for d in await archive.find_archived(4)]
+    assert names == ["n6", "n5", "n4", "n3"]
+    assert len(await archive.find_archived(50)) == 7
+    assert [d["full_name"] async for d in archive.iter_archived()] == [f"n{i}" for i in range(6, -1, -1)]
+
+
+@pytest.mark.anyio
+async def test_list_endpoint_paginates_across_hot_and_archived(db, small_batches):
+    from app.routes.contact import get_all_inquiries
+
+    await add_inquiries(db, 4)
+    await archive.run_archiver()
+    await add_inquiries(db, 3, age_days=1)
+
+    admin = {"id": "a"}
+    first = await get_all_inquiries(None, True, 1, 5, admin)
+    second = await get_all_inquiries(None, True, 2, 5, admin)
+    assert [i.archived for i in first] == [False] * 3 + [True] * 2
+    assert [i.archived for i in second] == [True] * 2
+    times = [i.created_at for i in first + second]
+    assert times == sorted(times, reverse=True)
+
+
+@pytest.mark.anyio
+async def test_delete_archived_repacks_and_drops_empty_batches(db, small_batches):
+    ids = await add_inquiries(db, 2)
+    await archive.run_archiver()
+
+    assert await archive.delete_archived(ids[0])
+    batch = await db.contact_inquiries_archive.find_one()
+    assert batch["ids"] == [ids[1]] and batch["count"] == 1
+    assert batch["min_created_at"] == batch["max_created_at"]
+    assert await archive.get_archived(ids[0]) is None
+
+    assert await archive.delete_archived(ids[1])
+    assert await db.contact_inquiries_archive.count_documents({}) == 0
+    assert not await archive.delete_archived(ids[1])
+
+
+@pytest.mark.anyio
+async def test_delete_archived_retries_after_concurrent_change(db, small_batches, monkeypatch):
+    ids = await add_inquiries(db, 3)
+    await archive.run_archiver()
+    collection = db.contact_inquiries_archive
+    real_find_one = type(collection).find_one
+    raced = []
+
+    async def find_one_then_race(self, *args, **kwargs):
+        batch = await real_find_one(self, *args, **kwargs)
+        if not raced:
+            # Another request removes a different inquiry between our read and write
+            raced.append(1)
+            remaining = [d for d in archive.unpack(batch) if d["_id"] != ids[2]]
+            await collection.update_one({"_id": batch["_id"]}, {"$set": {
+                "ids": [d["_id"] for d in remaining], "count": len(remaining),
+                "data": archive.pack(remaining),
+            }})
+        return batch
+
+    monkeypatch.setattr(type(collection), "find_one", find_one_then_race)
+    assert await archive.delete_archived(ids[0])
+    monkeypatch.undo()
+
+    batch = await collection.find_one()
+    assert batch["ids"] == [ids[1]]  # both deletes applied, neither undone
+    assert [d["_id"] for d in archive.unpack(batch)] == [ids[1]]
+
+
+@pytest.mark.anyio
+async def test_run_stops_when_lease_is_lost(db, small_batches, monkeypatch):
+    await add_inquiries(db, 7)
+
+    async def lost(*args):
+        return False
+
+    monkeypatch.setattr(archive.locks, "refresh", lost)
+    assert await archive.run_archiver() == 3  # one batch, then it notices and stops
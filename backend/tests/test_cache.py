@@ -0,0 +1,26 @@
+from app.cache import get_cache, invalidate
+
+
+def test_set_skipped_after_invalidation_during_read():
+    cache = get_cache("test_generation", ttl=60)
+    generation = cache.generation
+    invalidate("test_generation")  # a write lands while the read is in flight
+    cache.set("key", "stale", generation)
+    assert cache.get("key") is None
+
+    generation = cache.generation
+    cache.set("key", "fresh", generation)
+    assert cache.get("key") == "fresh"
+
+
+def test_set_without_generation_always_stores():
+    cache = get_cache("test_plain", ttl=60)
+    invalidate("test_plain")
+    cache.set("key", 1)
+    assert cache.get("key") == 1
+
+
+def test_expired_entries_are_dropped():
+    cache = get_cache("test_ttl", ttl=-1)
+    cache.set("key", 1)
+    assert cache.get("key") is None
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from app import feeds
+
+
+def post(**fields):
+    now = datetime.now(timezone.utc)
+    return {"slug": "hello", "title": {"en": "Hello"}, "status": "published",
+            "created_at": now, "updated_at": now, **fields}
+
+
+@pytest.mark.anyio
+async def test_patch_sets_and_removes_entries(db):
+    post_id = str((await db.blog_posts.insert_one(post())).inserted_id)
+    await feeds.patch("blog", post_id)
+    artifact = await db.site_artifacts.find_one({"_id": feeds.ARTIFACT_ID})
+    assert artifact["blog"][post_id]["slug"] == "hello"
+
+    await db.blog_posts.update_one({}, {"$set": {"status": "draft"}})
+    await feeds.patch("blog", post_id)
+    artifact = await db.site_artifacts.find_one({"_id": feeds.ARTIFACT_ID})
+    assert post_id not in artifact["blog"]
+    assert artifact["version"] == 2
+
+
+@pytest.mark.anyio
+async def test_patch_failure_is_logged_not_raised(db, monkeypatch, caplog):
+    async def down(section, doc_id):
+        raise AutoReconnect("primary stepped down")
+
+    monkeypatch.setattr(feeds, "_patch", down)
+    post_id = str((await db.blog_posts.insert_one(post())).inserted_id)
+
+    await feeds.patch("blog", post_id)
+    assert "Could not patch the feeds artifact" in caplog.text
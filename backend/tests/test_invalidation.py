@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from app import invalidation
+from app.cache import get_cache
+
+
+class FakeStream:
+    """A change stream yielding ``events``, then raising ``error`` (or idling)."""
+
+    def __init__(self, events, error=None):
+        self.events = list(events)
+        self.error = error
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.events:
+            change = self.events.pop(0)
+            self.resume_token = {"_data": change["_id"]}
+            return change
+        if self.error:
+            raise self.error
+        await asyncio.Event().wait()
+
+
+class FakeDB:
+    def __init__(self, db, streams):
+        self.change_stream_tokens = db.change_stream_tokens
+        self.streams = list(streams)
+        self.resumed_after = []
+
+    def watch(self, pipeline, resume_after=None):
+        self.resumed_after.append(resume_after)
+        return self.streams.pop(0)
+
+
+def change(n, coll="users"):
+    return {"_id": str(n), "ns": {"coll": coll}, "operationType": "update",
+            "documentKey": {"_id": n}}
+
+
+@pytest.fixture
+def listeners(monkeypatch):
+    monkeypatch.setattr(invalidation, "_listeners", {})
+    seen = []
+    invalidation.add_listener("users", seen.append)
+    return seen
+
+
+async def run_until(condition, task):
+    for _ in range(200):
+        if condition() or task.done():
+            break
+        await asyncio.sleep(0.01)
+
+
+def test_dispatch_clears_caches_and_isolates_listener_errors(monkeypatch):
+    monkeypatch.setattr(invalidation, "_listeners", {})
+    home = get_cache("home")
+    home.set("en", "cached")
+    seen = []
+
+    def broken(change):
+        raise RuntimeError("boom")
+
+    invalidation.add_listener("blog_posts", broken)
+    invalidation.add_listener("blog_posts", seen.append)
+    invalidation.dispatch("blog_posts", {"operationType": "insert"})
+    assert home.get("en") is None
+    assert seen == [{"operationType": "insert"}]
+
+
+@pytest.mark.anyio
+async def test_watcher_dispatches_and_throttles_token_saves(db, monkeypatch, listeners):
+    fake = FakeDB(db, [FakeStream([change(1), change(2), change(3)])])
+    monkeypatch.setattr(invalidation, "get_db", lambda: fake)
+    task = asyncio.create_task(invalidation.watch_changes())
+    await run_until(lambda: len(listeners) == 3, task)
+    task.cancel()
+
+    assert [c["documentKey"]["_id"] for c in listeners] == [1, 2, 3]
+    # Only the first event falls outside the save interval
+    state = await db.change_stream_tokens.find_one({"_id": invalidation.TOKEN_ID})
+    assert state["token"] == {"_data": "1"}
+
+
+@pytest.mark.anyio
+async def test_watcher_resumes_from_stored_token(db, monkeypatch, listeners):
+    await db.change_stream_tokens.insert_one(
+        {"_id": invalidation.TOKEN_ID, "token": {"_data": "saved"}}
+    )
+    fake = FakeDB(db, [FakeStream([])])
+    monkeypatch.setattr(invalidation, "get_db", lambda: fake)
+    task = asyncio.create_task(invalidation.watch_changes())
+    await run_until(lambda: fake.resumed_after, task)
+    task.cancel()
+    assert fake.resumed_after == [{"_data": "saved"}]
+
+
+@pytest.mark.anyio
+async def test_history_lost_clears_everything_and_restarts_from_now(db, monkeypatch, listeners):
+    lost = OperationFailure("history lost", code=286)
+    fake = FakeDB(db, [FakeStream([change(1)], error=lost), FakeStream([])])
+    monkeypatch.setattr(invalidation, "get_db", lambda: fake)
+    home = get_cache("home")
+    home.set("en", "cached")
+    task = asyncio.create_task(invalidation.watch_changes())
+    await run_until(lambda: len(fake.resumed_after) == 2, task)
+    task.cancel()
+
+    assert fake.resumed_after == [None, None]
+    assert listeners[-1] == {"operationType": "invalidate"}
+    assert home.get("en") is None
+
+
+@pytest.mark.anyio
+async def test_watcher_stops_without_replica_set(db, monkeypatch, listeners):
+    unsupported = OperationFailure("not a replica set", code=40573)
+    fake = FakeDB(db, [FakeStream([], error=unsupported)])
+    monkeypatch.setattr(invalidation, "get_db", lambda: fake)
+    await asyncio.wait_for(invalidation.watch_changes(), timeout=1)
+
+
+@pytest.mark.anyio
+async def test_token_load_failure_is_retried(db, monkeypatch, listeners):
+    fake = FakeDB(db, [FakeStream([])])
+    monkeypatch.setattr(invalidation, "get_db", lambda: fake)
+    calls = []
+
+    async def flaky_load():
+        calls.append(1)
+        if len(calls) == 1:
+            raise AutoReconnect("down")
+        return None
+
+    monkeypatch.setattr(invalidation, "_load_token", flaky_load)
+    task = asyncio.create_task(invalidation.watch_changes())
+    await asyncio.sleep(1.2)  # first retry backoff is 1s
+    task.cancel()
+    assert len(calls) == 2
+    assert fake.resumed_after == [None]
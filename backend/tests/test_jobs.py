@@ -0,0 +1,196 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import BackgroundTasks
+from pymongo.errors import ServerSelectionTimeoutError
+
+from app import jobs
+
+
+def now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Register test handlers; each records the payloads it was called with."""
+    seen = []
+
+    async def ok(payload):
+        seen.append(payload)
+
+    async def broken(payload):
+        seen.append(payload)
+        raise ValueError("boom")
+
+    monkeypatch.setitem(jobs._handlers, "test_ok", ok)
+    monkeypatch.setitem(jobs._handlers, "test_broken", broken)
+    monkeypatch.setattr(jobs, "_wakeup", None)
+    return seen
+
+
+@pytest.mark.anyio
+async def test_runs_queued_job(db, calls):
+    job_id = await jobs.enqueue("test_ok", {"n": 1})
+    await jobs.work(drain=True)
+
+    doc = await db.jobs.find_one({"_id": job_id})
+    assert calls == [{"n": 1}]
+    assert doc["status"] == "done"
+    assert doc["attempts"] == 1
+    assert doc["worker"] == jobs.WORKER_ID
+    assert "lease_until" not in doc
+
+
+@pytest.mark.anyio
+async def test_delayed_job_waits(db, calls):
+    await jobs.enqueue("test_ok", {}, delay=60)
+    await jobs.work(drain=True)
+    assert calls == []
+
+
+@pytest.mark.anyio
+async def test_idempotency_key_dedupes(db, calls):
+    await db.jobs.create_index(
+        "idempotency_key", unique=True,
+        partialFilterExpression={"idempotency_key": {"$type": "string"}},
+    )
+    first = await jobs.enqueue("test_ok", {"n": 1}, idempotency_key="k")
+    second = await jobs.enqueue("test_ok", {"n": 2}, idempotency_key="k")
+    await jobs.enqueue("test_ok", {"n": 3})
+
+    assert first == second
+    assert await db.jobs.count_documents({}) == 2
+    await jobs.work(drain=True)
+    assert sorted(c["n"] for c in calls) == [1, 3]
+
+
+@pytest.mark.anyio
+async def test_failure_is_retried_with_backoff(db, calls):
+    job_id = await jobs.enqueue("test_broken", {})
+    await jobs.work(drain=True)
+
+    doc = await db.jobs.find_one({"_id": job_id})
+    assert doc["status"] == "queued"
+    assert "ValueError: boom" in doc["error"]
+    assert doc["run_at"] > now() + timedelta(seconds=1)  # 2 ** attempts
+    assert len(calls) == 1  # not ready again yet
+
+
+@pytest.mark.anyio
+async def test_failure_is_permanent_after_max_attempts(db, calls, monkeypatch):
+    monkeypatch.setattr(jobs.settings, "JOB_MAX_ATTEMPTS", 2)
+    job_id = await jobs.enqueue("test_broken", {})
+    for _ in range(2):
+        await db.jobs.update_one({"_id": job_id}, {"$set": {"run_at": now()}})
+        await jobs.work(drain=True)
+
+    doc = await db.jobs.find_one({"_id": job_id})
+    assert doc["status"] == "failed"
+    assert doc["attempts"] == 2
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_unknown_type_fails_without_retry(db, calls):
+    job_id = await jobs.enqueue("test_missing", {})
+    await jobs.work(drain=True)
+
+    doc = await db.jobs.find_one({"_id": job_id})
+    assert doc["status"] == "failed"
+    assert "No handler" in doc["error"]
+
+
+@pytest.mark.anyio
+async def test_expired_lease_is_reclaimed(db, calls):
+    expired = {"type": "test_ok", "payload": {}, "status": "running", "attempts": 1,
+               "worker": "dead:1", "run_at": now(), "lease_until": now() - timedelta(seconds=1)}
+    held = {**expired, "lease_until": now() + timedelta(minutes=1)}
+    expired_id = (await db.jobs.insert_one(expired)).inserted_id
+    held_id = (await db.jobs.insert_one(held)).inserted_id
+
+    await jobs.work(drain=True)
+
+    assert (await db.jobs.find_one({"_id": expired_id}))["attempts"] == 2
+    assert (await db.jobs.find_one({"_id": expired_id}))["status"] == "done"
+    assert (await db.jobs.find_one({"_id": held_id}))["status"] == "running"
+
+
+@pytest.mark.anyio
+async def test_lease_is_renewed_while_handler_runs(db, calls, monkeypatch):
+    monkeypatch.setattr(jobs.settings, "JOB_LEASE_SECONDS", 0.3)
+    runs = []
+
+    async def slow(payload):
+        runs.append(payload)
+        await asyncio.sleep(0.8)
+
+    monkeypatch.setitem(jobs._handlers, "test_slow", slow)
+    job_id = await jobs.enqueue("test_slow", {})
+    worker = asyncio.create_task(jobs.work(drain=True))
+    await asyncio.sleep(0.5)  # past the first lease
+
+    assert await jobs._claim(db) is None
+    await worker
+    doc = await db.jobs.find_one({"_id": job_id})
+    assert doc["status"] == "done"
+    assert len(runs) == 1
+
+
+@pytest.mark.anyio
+async def test_reclaimed_job_is_not_finished_by_old_worker(db, calls):
+    job_id = await jobs.enqueue("test_ok", {})
+    doc = await jobs._claim(db)
+    # Lease lost: another worker reclaimed it in the meantime
+    await db.jobs.update_one({"_id": job_id}, {"$inc": {"attempts": 1}})
+
+    await jobs._run(db, doc)
+    assert (await db.jobs.find_one({"_id": job_id}))["status"] == "running"
+
+
+@pytest.mark.anyio
+async def test_worker_survives_database_errors(db, calls, monkeypatch):
+    real_claim = jobs._claim
+    attempts = []
+
+    async def flaky_claim(db):
+        attempts.append(1)
+        if len(attempts) <= 2:
+            raise ServerSelectionTimeoutError("down")
+        return await real_claim(db)
+
+    monkeypatch.setattr(jobs, "_claim", flaky_claim)
+    await jobs.enqueue("test_ok", {"n": 1})
+
+    with pytest.raises(ServerSelectionTimeoutError):
+        await jobs.work(drain=True)  # draining callers see the error
+
+    monkeypatch.setattr(jobs, "_wakeup", asyncio.Event())
+    worker = asyncio.create_task(jobs.work())
+    try:
+        for _ in range(30):  # the worker backs off for a second first
+            if calls:
+                break
+            await asyncio.sleep(0.1)
+    finally:
+        worker.cancel()
+    assert calls == [{"n": 1}]
+
+
+def test_drain_after_response_only_without_workers(monkeypatch):
+    monkeypatch.setattr(jobs, "_wakeup", None)
+    background = BackgroundTasks()
+    jobs.drain_after_response(background)
+    assert [t.func for t in background.tasks] == [jobs._drain]
+
+    monkeypatch.setattr(jobs, "_wakeup", asyncio.Event())
+    background = BackgroundTasks()
+    jobs.drain_after_response(background)
+    assert background.tasks == []
+
+
+def test_start_workers_zero_runs_none(monkeypatch):
+    monkeypatch.setattr(jobs, "_wakeup", None)
+    assert jobs.start_workers(0) == []
+    assert jobs._wakeup is None
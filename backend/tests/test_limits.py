@@ -0,0 +1,76 @@
+import httpx
+import pytest
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app import limits
+from app.limits import LoadSheddingMiddleware, TokenBucket, classify
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def client_for(app, client=("203.0.113.7", 5000)):
+    transport = httpx.ASGITransport(app=app, client=client)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.fixture
+def inquiry_limit(monkeypatch):
+    monkeypatch.setattr(limits.settings, "RATE_LIMITS", {"inquiry": 4})  # burst of 2
+
+
+def test_classify():
+    assert classify("POST", "/api/auth/login", b"") == "auth"
+    assert classify("POST", "/api/auth/register", b"") == "auth"
+    assert classify("GET", "/api/auth/me", b"") == "read"
+    assert classify("POST", "/api/blog/upload-image", b"") == "upload"
+    assert classify("GET", "/api/blog/posts", b"search=x") == "search"
+    assert classify("GET", "/api/blog/admin/posts", b"") == "admin"
+    assert classify("GET", "/api/blog/posts", b"") == "read"
+
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(rate_per_minute=60, burst=1)
+    assert bucket.take("a") == 0
+    assert bucket.take("a") > 0
+    assert bucket.take("b") == 0
+
+
+@pytest.mark.anyio
+async def test_forwarded_for_header_does_not_bypass_rate_limit(inquiry_limit):
+    app = LoadSheddingMiddleware(ok_app)
+    async with client_for(app) as client:
+        codes = [
+            (await client.post(
+                "/api/contact/inquiries", headers={"X-Forwarded-For": f"198.51.100.{i}"}
+            )).status_code
+            for i in range(4)
+        ]
+    assert codes == [201, 201, 429, 429]
+
+
+@pytest.mark.anyio
+async def test_trusted_proxy_address_is_used(inquiry_limit):
+    app = ProxyHeadersMiddleware(LoadSheddingMiddleware(ok_app), trusted_hosts="10.0.0.0/8")
+    async with client_for(app, client=("10.1.2.3", 5000)) as client:
+        async def post(ip):
+            headers = {"X-Forwarded-For": ip}
+            return (await client.post("/api/contact/inquiries", headers=headers)).status_code
+
+        assert [await post("198.51.100.1") for _ in range(3)] == [201, 201, 429]
+        assert await post("198.51.100.2") == 201
+
+
+@pytest.mark.anyio
+async def test_probes_are_exempt(monkeypatch):
+    monkeypatch.setattr(limits.settings, "CONCURRENCY_LIMITS", {"read": 0})
+    monkeypatch.setattr(limits.settings, "QUEUE_TIMEOUT", 0.01)
+    app = LoadSheddingMiddleware(ok_app)
+    async with client_for(app) as client:
+        assert (await client.get("/api/health")).status_code == 201
+        assert (await client.get("/api/ready")).status_code == 201
+        response = await client.get("/api/blog/posts")
+        assert response.status_code == 503
+        assert response.headers["retry-after"]
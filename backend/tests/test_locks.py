@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import locks
+
+LEASE = timedelta(minutes=10)
+
+
+@pytest.mark.anyio
+async def test_lease_is_exclusive_until_released(db):
+    owner = await locks.acquire(db, "job", LEASE)
+    assert owner
+    assert await locks.acquire(db, "job", LEASE) is None
+    assert await locks.acquire(db, "other", LEASE)
+    await locks.release(db, "job", owner)
+    assert await locks.acquire(db, "job", LEASE)
+
+
+@pytest.mark.anyio
+async def test_expired_holder_cannot_touch_the_new_lease(db):
+    first = await locks.acquire(db, "job", LEASE)
+    expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db.locks.update_one({"_id": "job"}, {"$set": {"expires_at": expired}})
+    second = await locks.acquire(db, "job", LEASE)
+    assert second and second != first
+
+    await locks.release(db, "job", first)
+    assert not await locks.refresh(db, "job", first, LEASE)
+    assert (await db.locks.find_one({"_id": "job"}))["owner"] == second
+    assert await locks.refresh(db, "job", second, LEASE)
+    await locks.release(db, "job", second)
+    assert await db.locks.count_documents({}) == 0
@@ -0,0 +1,186 @@
+from app.rendering import (
+    HIGHLIGHT_CLASS,
+    IMAGE_CLASS,
+    LINK_CLASS,
+    RENDER_VERSION,
+    public_rendered,
+    render_content,
+    render_document,
+)
+
+
+def doc(*blocks):
+    return {"type": "doc", "content": list(blocks)}
+
+
+def para(*content, **attrs):
+    node = {"type": "paragraph", "content": list(content)}
+    if attrs:
+        node["attrs"] = attrs
+    return node
+
+
+def text(value, *marks):
+    node = {"type": "text", "text": value}
+    if marks:
+        node["marks"] = list(marks)
+    return node
+
+
+def heading(value, level=2):
+    return {"type": "heading", "attrs": {"level": level}, "content": [text(value)]}
+
+
+def html_of(*blocks):
+    return render_document(doc(*blocks))["html"]
+
+
+# ─── Escaping ──────────────────────────────────────────────
+
+def test_text_is_escaped():
+    assert html_of(para(text("<script>alert(1)</script> & co"))) == (
+        "<p>&lt;script&gt;alert(1)&lt;/script&gt; &amp; co</p>"
+    )
+
+
+def test_attribute_values_are_escaped():
+    out = html_of({"type": "image", "attrs": {"src": "/a.png", "alt": '"><img onerror=x>'}})
+    assert 'alt="&quot;&gt;&lt;img onerror=x&gt;"' in out
+    assert "<img onerror" not in out
+
+
+def test_unknown_nodes_keep_text_but_drop_wrapper():
+    out = html_of({"type": "iframe", "attrs": {"src": "https://x"}, "content": [text("hi")]})
+    assert out == "hi"
+
+
+def test_code_block_language_must_be_alphanumeric():
+    block = {"type": "codeBlock", "attrs": {"language": 'js" onclick="x'}, "content": [text("a<b")]}
+    assert html_of(block) == "<pre><code>a&lt;b</code></pre>"
+    block["attrs"]["language"] = "python"
+    assert html_of(block) == '<pre><code class="language-python">a&lt;b</code></pre>'
+
+
+# ─── URL allow-list ────────────────────────────────────────
+
+def test_unsafe_link_is_dropped():
+    for href in ("javascript:alert(1)", "JaVaScRiPt:alert(1)", "data:text/html,x", "vbscript:x"):
+        out = html_of(para(text("x", {"type": "link", "attrs": {"href": href}})))
+        assert out == "<p>x</p>", href
+
+
+def test_safe_link_gets_site_class_and_rel():
+    for href in ("https://example.com", "mailto:a@b.c", "tel:+1", "/blog", "#top"):
+        out = html_of(para(text("x", {"type": "link", "attrs": {"href": href}})))
+        assert f'href="{href}"' in out
+        assert f'class="{LINK_CLASS}"' in out
+        assert 'rel="noopener noreferrer nofollow"' in out
+
+
+def test_unsafe_image_is_dropped():
+    assert html_of({"type": "image", "attrs": {"src": "javascript:x"}}) == ""
+    assert html_of({"type": "image", "attrs": {}}) == ""
+
+
+def test_image_gets_site_class():
+    out = html_of({"type": "image", "attrs": {"src": "https://cdn/x.png", "alt": "a"}})
+    assert out == (
+        f'<img src="https://cdn/x.png" alt="a" class="{IMAGE_CLASS}" loading="lazy">'
+    )
+
+
+# ─── Colour and alignment allow-lists ─────────────────────
+
+def test_colour_allow_list():
+    def coloured(color):
+        return html_of(para(text("x", {"type": "textStyle", "attrs": {"color": color}})))
+
+    assert coloured("#ff0000") == '<p><span style="color: #ff0000">x</span></p>'
+    assert coloured("rgb(1, 2, 3)") == '<p><span style="color: rgb(1, 2, 3)">x</span></p>'
+    assert coloured("red") == '<p><span style="color: red">x</span></p>'
+    for bad in ("red; background: url(x)", "expression(alert(1))", '"><b>', 42):
+        assert coloured(bad) == "<p>x</p>", bad
+
+
+def test_highlight_uses_site_class():
+    plain = html_of(para(text("x", {"type": "highlight"})))
+    assert plain == f'<p><mark class="{HIGHLIGHT_CLASS}">x</mark></p>'
+    bad = html_of(para(text("x", {"type": "highlight", "attrs": {"color": "red;x:y"}})))
+    assert bad == plain
+
+
+def test_alignment_allow_list():
+    assert html_of(para(text("x"), textAlign="center")) == '<p style="text-align: center">x</p>'
+    assert html_of(para(text("x"), textAlign="center;color:red")) == "<p>x</p>"
+
+
+# ─── Headings and metadata ─────────────────────────────────
+
+def test_duplicate_heading_anchors_are_numbered():
+    result = render_document(doc(heading("Intro"), heading("Intro"), heading("Intro", 3)))
+    assert [e["id"] for e in result["toc"]] == ["intro", "intro-1", "intro-2"]
+    assert [e["level"] for e in result["toc"]] == [2, 2, 3]
+    assert '<h2 id="intro-1">Intro</h2>' in result["html"]
+
+
+def test_heading_without_text_gets_fallback_anchor():
+    result = render_document(doc(heading("!!!")))
+    assert result["toc"][0]["id"] == "section"
+
+
+def test_metadata():
+    words = " ".join(["word"] * 450)
+    image = {"type": "image", "attrs": {"src": "/first.png"}}
+    result = render_document(doc(para(text(words)), image))
+    assert result["word_count"] == 450
+    assert result["reading_time"] == 2
+    assert result["first_image"] == "/first.png"
+    assert result["text_excerpt"].endswith("…")
+    assert len(result["text_excerpt"]) <= 201
+
+
+def test_empty_document():
+    result = render_document(doc())
+    assert result["html"] == ""
+    assert result["reading_time"] == 0
+
+
+# ─── Block reuse ───────────────────────────────────────────
+
+def test_unchanged_blocks_reuse_previous_html():
+    first = render_document(doc(para(text("a")), para(text("b"))))
+    # Tamper with the cached HTML to prove it is reused rather than re-rendered
+    first["blocks"][0]["html"] = "<p>cached</p>"
+    second = render_document(doc(para(text("a")), para(text("changed"))), first)
+    assert second["html"] == "<p>cached</p><p>changed</p>"
+
+
+def test_cache_is_ignored_for_other_render_versions():
+    first = render_document(doc(para(text("a"))))
+    first["blocks"][0]["html"] = "<p>cached</p>"
+    first["version"] = RENDER_VERSION - 1
+    assert render_document(doc(para(text("a"))), first)["html"] == "<p>a</p>"
+
+
+def test_heading_reuse_depends_on_its_anchor():
+    first = render_document(doc(heading("Intro")))
+    # The same heading now comes second, so its anchor changes and it re-renders
+    second = render_document(doc(heading("Intro"), heading("Intro")), first)
+    assert second["html"] == '<h2 id="intro">Intro</h2><h2 id="intro-1">Intro</h2>'
+
+
+# ─── Locales ───────────────────────────────────────────────
+
+def test_render_content_locales():
+    single = render_content(doc(para(text("x"))))
+    assert list(single) == ["en"]
+    per_locale = render_content({"ar": doc(para(text("س"))), "xx": doc(), "fr": "nope"})
+    assert list(per_locale) == ["ar"]
+    assert render_content(None) == {}
+
+
+def test_public_rendered():
+    stored = render_content(doc(para(text("x"))))
+    full = public_rendered(stored)
+    assert "blocks" not in full["en"] and "version" not in full["en"]
+    assert set(public_rendered(stored, summary=True)["en"]) == {"reading_time", "text_excerpt"}
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+from pymongo.errors import AutoReconnect
+
+from app import locks, snapshot
+
+
+@pytest.fixture
+def snap(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot.settings, "SNAPSHOT_PATH", str(tmp_path / "snap.sqlite3"))
+    monkeypatch.setattr(snapshot.settings, "SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(snapshot, "REFRESH_DELAY", 0.01)
+    monkeypatch.setattr(snapshot, "_pending", None)
+    monkeypatch.setattr(snapshot, "_requested_at", None)
+    scans = []
+    real_refresh = snapshot.refresh
+
+    async def counting_refresh():
+        scans.append(1)
+        await real_refresh()
+
+    monkeypatch.setattr(snapshot, "refresh", counting_refresh)
+    return scans
+
+
+async def add_post(db, slug, **fields):
+    now = datetime.now(timezone.utc)
+    await db.blog_posts.insert_one({
+        "slug": slug, "status": "published", "title": {"en": slug.title()},
+        "category": "news", "tags": [], "created_at": now, "updated_at": now, **fields,
+    })
+
+
+async def settle():
+    while snapshot._pending is not None and not snapshot._pending.done():
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_refresh_writes_a_readable_snapshot(db, snap):
+    await add_post(db, "first")
+    await add_post(db, "draft", status="draft")
+    snapshot.schedule_refresh()
+    await settle()
+    assert snap == [1]
+    assert [p["slug"] for p in snapshot.blog_posts()] == ["first"]
+    assert snapshot.blog_post("draft") == []
+    assert snapshot.started_at() > 0
+
+
+@pytest.mark.anyio
+async def test_calls_during_a_refresh_queue_one_more(db, snap, monkeypatch):
+    reading_done = threading.Event()
+    release = threading.Event()
+    real_write = snapshot._write
+
+    def slow_write(*args):
+        reading_done.set()
+        release.wait(5)
+        real_write(*args)
+
+    monkeypatch.setattr(snapshot, "_write", slow_write)
+    snapshot.schedule_refresh()
+    await asyncio.to_thread(reading_done.wait, 5)
+    # Written after the running refresh read MongoDB
+    await add_post(db, "late")
+    snapshot.schedule_refresh()
+    snapshot.schedule_refresh()
+    release.set()
+    await settle()
+    assert len(snap) == 2
+    assert [p["slug"] for p in snapshot.blog_posts()] == ["late"]
+
+
+@pytest.mark.anyio
+async def test_worker_skips_scan_covered_by_lease_holder(db, snap):
+    # Another worker on this host is rebuilding
+    owner = await locks.acquire(db, snapshot.LOCK_ID, timedelta(minutes=1))
+    snapshot.schedule_refresh()
+    await asyncio.sleep(0.1)
+    assert snap == []
+
+    # It finishes with a snapshot that started after our request
+    await add_post(db, "theirs")
+    await snapshot.refresh()
+    snap.clear()
+    await locks.release(db, snapshot.LOCK_ID, owner)
+    await settle()
+    assert snap == []  # covered; no second scan
+    assert [p["slug"] for p in snapshot.blog_posts()] == ["theirs"]
+
+
+@pytest.mark.anyio
+async def test_read_with_fallback(db, snap):
+    await add_post(db, "cached")
+    await snapshot.refresh()
+
+    async def down():
+        raise AutoReconnect("down")
+
+    response = Response()
+    result = await snapshot.read_with_fallback(response, down(), snapshot.blog_posts)
+    assert [p["slug"] for p in result] == ["cached"]
+    assert set(result[0]["rendered"]) == set()
+    assert response.headers[snapshot.STALE_HEADER] == "true"
+
+    async def ok():
+        return "live"
+
+    response = Response()
+    assert await snapshot.read_with_fallback(response, ok(), snapshot.blog_posts) == "live"
+    assert snapshot.STALE_HEADER not in response.headers
+
+
+@pytest.mark.anyio
+async def test_fallback_without_snapshot_is_503(db, snap):
+    async def down():
+        raise AutoReconnect("down")
+
+    with pytest.raises(HTTPException) as err:
+        await snapshot.read_with_fallback(Response(), down(), snapshot.blog_posts)
+    assert err.value.status_code == 503
@@ -454,6 +454,7 @@ const translations: Record<Language, Record<string, string>> = {
     "blog.like": "Like",
     "blog.liked": "Liked",
     "blog.share": "Share",
+    "blog.contents": "Contents",
 
     // Admin
     "admin.dashboard": "Dashboard",
@@ -967,6 +968,7 @@ const translations: Record<Language, Record<string, string>> = {
     "blog.like": "إعجاب",
     "blog.liked": "أعجبني",
     "blog.share": "مشاركة",
+    "blog.contents": "المحتويات",
 
     // Admin
     "admin.dashboard": "لوحة التحكم",
@@ -1480,6 +1482,7 @@ const translations: Record<Language, Record<string, string>> = {
     "blog.like": "J'aime",
     "blog.liked": "Aimé",
     "blog.share": "Partager",
+    "blog.contents": "Sommaire",
 
     // Admin
     "admin.dashboard": "Tableau de bord",
@@ -1993,6 +1996,7 @@ const translations: Record<Language, Record<string, string>> = {
     "blog.like": "Gefällt mir",
     "blog.liked": "Gefällt mir",
     "blog.share": "Teilen",
+    "blog.contents": "Inhalt",
 
     // Admin
     "admin.dashboard": "Dashboard",
@@ -2068,6 +2072,9 @@ const LanguageContext = createContext<LanguageContextType | undefined>(undefined
 
 export const LanguageProvider = ({ children }: { children: ReactNode }) => {
   const [language, setLanguageState] = useState<Language>(() => {
+    // ?lang= comes from sitemap hreflang alternates and feed links
+    const param = new URLSearchParams(window.location.search).get("lang");
+    if (param && param in translations) return param as Language;
     const saved = localStorage.getItem("language");
     return (saved as Language) || "en";
   });
@@ -120,6 +120,18 @@ export interface LocalizedText {
   de: string;
 }
 
+export interface RenderedContent {
+  html: string;
+  word_count: number;
+  reading_time: number;
+  toc: { level: number; text: string; id: string }[];
+  first_image: string;
+  text_excerpt: string;
+}
+
+// List endpoints only carry these fields of RenderedContent
+export type RenderedSummary = Pick<RenderedContent, "reading_time" | "text_excerpt">;
+
 export interface BlogPost {
   id: string;
   title: LocalizedText;
@@ -133,11 +145,12 @@ export interface BlogPost {
   slug: string;
   author_id: string;
   author_name: string;
+  rendered?: Record<string, RenderedSummary & Partial<RenderedContent>>;
   created_at: string;
   updated_at: string;
 }
 
-export type BlogPostInput = Omit<BlogPost, "id" | "slug" | "author_id" | "author_name" | "created_at" | "updated_at">;
+export type BlogPostInput = Omit<BlogPost, "id" | "slug" | "author_id" | "author_name" | "rendered" | "created_at" | "updated_at">;
 
 export const blogApi = {
   // Public
@@ -246,6 +259,7 @@ export interface ContactInquiry {
   budget: string;
   message: string;
   read: boolean;
+  archived?: boolean;
   created_at: string;
 }
 
@@ -269,9 +283,10 @@ export const contactApi = {
     }),
 
   // Admin
-  getAllInquiries: (params?: { read?: boolean }) => {
+  getAllInquiries: (params?: { read?: boolean; include_archived?: boolean }) => {
     const query = new URLSearchParams();
     if (params?.read !== undefined) query.set("read", String(params.read));
+    if (params?.include_archived) query.set("include_archived", "true");
     return apiFetch<ContactInquiry[]>(`/api/contact/admin/inquiries?${query}`);
   },
 
@@ -282,6 +297,27 @@ export const contactApi = {
 
   deleteInquiry: (id: string) =>
     apiFetch<void>(`/api/contact/admin/inquiries/${id}`, { method: "DELETE" }),
+
+  // CSV download; fetched as a blob because the endpoint needs the bearer token
+  exportInquiries: async (params?: { include_archived?: boolean }): Promise<Blob> => {
+    const token = getToken();
+    const query = new URLSearchParams();
+    if (params?.include_archived) query.set("include_archived", "true");
+
+    let res: Response;
+    try {
+      res = await fetch(`${API_BASE}/api/contact/admin/inquiries/export?${query}`, {
+        headers: token ? { Authorization: `Bearer ${token}` } : {},
+      });
+    } catch {
+      throw new Error(
+        "Unable to connect to the server. Please make sure the backend is running."
+      );
+    }
+
+    if (!res.ok) throw new Error("Export failed");
+    return res.blob();
+  },
 };
 
 // ─── Helpers ──────────────────────────────────────────────
@@ -300,3 +336,11 @@ export function formatDate(dateStr: string, locale: string = "en"): string {
     day: "numeric",
   });
 }
+
+// Minutes to read, from the API's rendered output; estimates from the raw JSON
+// only for posts the backend has not rendered yet
+export function readingTime(post: BlogPost, language: string): number {
+  const rendered = post.rendered?.[language] || post.rendered?.en;
+  if (rendered) return Math.max(1, rendered.reading_time);
+  return Math.max(1, Math.ceil(JSON.stringify(post.content || {}).length / 1000));
+}
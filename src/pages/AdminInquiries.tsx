@@ -11,6 +11,8 @@ import {
   ChevronDown,
   ChevronUp,
   Inbox,
+  Archive,
+  Download,
 } from "lucide-react";
 import { useLanguage } from "@/contexts/LanguageContext";
 import { contactApi, type ContactInquiry } from "@/lib/api";
@@ -23,10 +25,12 @@ const AdminInquiries = () => {
   const [filter, setFilter] = useState<"all" | "unread" | "read">("all");
   const [expandedId, setExpandedId] = useState<string | null>(null);
   const [deleteConfirm, setDeleteConfirm] = useState<string | null>(null);
+  const [includeArchived, setIncludeArchived] = useState(false);
+  const [exporting, setExporting] = useState(false);
 
   const loadInquiries = async () => {
     try {
-      const data = await contactApi.getAllInquiries();
+      const data = await contactApi.getAllInquiries({ include_archived: includeArchived });
       setInquiries(data);
     } catch (err) {
       console.error("Failed to load inquiries:", err);
@@ -37,7 +41,7 @@ const AdminInquiries = () => {
 
   useEffect(() => {
     loadInquiries();
-  }, []);
+  }, [includeArchived]);
 
   const filteredInquiries = inquiries.filter((inq) => {
     if (filter === "unread") return !inq.read;
@@ -69,6 +73,23 @@ const AdminInquiries = () => {
     setDeleteConfirm(null);
   };
 
+  const handleExport = async () => {
+    setExporting(true);
+    try {
+      const blob = await contactApi.exportInquiries({ include_archived: includeArchived });
+      const url = URL.createObjectURL(blob);
+      const link = document.createElement("a");
+      link.href = url;
+      link.download = "inquiries.csv";
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      toast.error("Failed to export inquiries");
+    } finally {
+      setExporting(false);
+    }
+  };
+
   const toggleExpand = (id: string) => {
     setExpandedId(expandedId === id ? null : id);
     // Auto-mark as read when opening
@@ -95,6 +116,28 @@ const AdminInquiries = () => {
             )}
           </p>
         </div>
+        <div className="flex items-center gap-3">
+          <label className="flex items-center gap-2 font-body text-xs text-charcoal-light cursor-pointer">
+            <input
+              type="checkbox"
+              checked={includeArchived}
+              onChange={(e) => {
+                setLoading(true);
+                setIncludeArchived(e.target.checked);
+              }}
+              className="accent-gold"
+            />
+            Include archived
+          </label>
+          <button
+            onClick={handleExport}
+            disabled={exporting}
+            className="flex items-center gap-1.5 rounded-lg border border-gray-200 bg-white px-3 py-1.5 font-body text-xs text-charcoal hover:bg-gray-50 transition-colors disabled:opacity-50"
+          >
+            <Download className="h-3.5 w-3.5" />
+            Export CSV
+          </button>
+        </div>
       </div>
 
       {/* Filter Tabs */}
@@ -196,6 +239,12 @@ const AdminInquiries = () => {
                     {!inq.read && (
                       <span className="h-2 w-2 rounded-full bg-gold flex-shrink-0" />
                     )}
+                    {inq.archived && (
+                      <span className="inline-flex items-center gap-1 rounded-full bg-gray-100 px-2 py-0.5 text-[10px] font-medium text-charcoal-light flex-shrink-0">
+                        <Archive className="h-3 w-3" />
+                        Archived
+                      </span>
+                    )}
                   </div>
                   <p className="font-body text-sm text-charcoal-light truncate">
                     {inq.service_type} · {inq.project_type || "General"}
@@ -13,7 +13,7 @@ import { useLanguage } from "@/contexts/LanguageContext";
 import Navbar from "@/components/Navbar";
 import Footer from "@/components/Footer";
 import AIModal from "@/components/AIModal";
-import { blogApi, formatDate, type BlogPost } from "@/lib/api";
+import { blogApi, formatDate, readingTime, type BlogPost } from "@/lib/api";
 
 const categories = [
   { key: "all", label: "All" },
@@ -243,7 +243,7 @@ const FeaturedCard = ({
           </span>
           <span className="flex items-center gap-1 font-body text-xs text-cream/70">
             <Clock className="h-3 w-3" />
-            {Math.max(1, Math.ceil(JSON.stringify(post.content || {}).length / 1000))} min read
+            {readingTime(post, language)} min read
           </span>
         </div>
         <h3 className="font-display text-2xl md:text-3xl text-cream mb-2 group-hover:text-gold transition-colors">
@@ -309,7 +309,7 @@ const BlogCard = ({
           </span>
           <span className="flex items-center gap-1 font-body text-xs text-charcoal-light">
             <Clock className="h-3 w-3" />
-            {Math.max(1, Math.ceil(JSON.stringify(post.content || {}).length / 1000))} min
+            {readingTime(post, language)} min
           </span>
         </div>
 
@@ -25,9 +25,12 @@ import AIModal from "@/components/AIModal";
 import {
   blogApi,
   formatDate,
+  readingTime,
   type BlogPost,
 } from "@/lib/api";
 
+// Fallback renderer for posts without server output. The classes below are
+// also emitted by backend/app/rendering.py (IMAGE_CLASS etc.); keep in sync.
 const extensions = [
   StarterKit,
   Image.configure({
@@ -121,13 +124,17 @@ const BlogPostPage = () => {
     );
   }
 
-  // Render TipTap content to HTML
-  let htmlContent = "";
-  try {
-    const contentJSON = typeof post.content === "string" ? JSON.parse(post.content) : post.content;
-    htmlContent = generateHTML(contentJSON, extensions);
-  } catch {
-    htmlContent = "<p>No content available.</p>";
+  // Prefer the HTML pre-rendered by the API; fall back to rendering TipTap JSON
+  const rendered = post.rendered?.[language] || post.rendered?.en;
+  let htmlContent = rendered?.html || "";
+  const toc = rendered?.toc || [];
+  if (!htmlContent) {
+    try {
+      const contentJSON = typeof post.content === "string" ? JSON.parse(post.content) : post.content;
+      htmlContent = generateHTML(contentJSON, extensions);
+    } catch {
+      htmlContent = "<p>No content available.</p>";
+    }
   }
 
   const handleShare = async () => {
@@ -185,7 +192,7 @@ const BlogPostPage = () => {
               </span>
               <span className="flex items-center gap-1 font-body text-xs text-cream/60">
                 <Clock className="h-3 w-3" />
-                {Math.max(1, Math.ceil(JSON.stringify(post.content || {}).length / 1000))} min read
+                {readingTime(post, language)} min read
               </span>
             </div>
 
@@ -233,6 +240,25 @@ const BlogPostPage = () => {
               </p>
             )}
 
+            {/* Table of contents */}
+            {toc.length > 1 && (
+              <nav className="mb-10 rounded-2xl bg-white p-6 border border-charcoal/10">
+                <p className="font-display text-lg text-charcoal mb-3">{t("blog.contents")}</p>
+                <ul className="space-y-1.5">
+                  {toc.map((entry) => (
+                    <li key={entry.id} style={{ paddingInlineStart: `${(entry.level - 1) * 0.75}rem` }}>
+                      <a
+                        href={`#${entry.id}`}
+                        className="font-body text-sm text-charcoal-light hover:text-gold transition-colors"
+                      >
+                        {entry.text}
+                      </a>
+                    </li>
+                  ))}
+                </ul>
+              </nav>
+            )}
+
             {/* Content */}
             <div
               className="prose prose-lg max-w-none font-body text-charcoal